@@ -0,0 +1,71 @@
+"""Safe evaluation of plain arithmetic expressions, shared by the math tools.
+
+The Semantic Kernel app (Azure/) and the ADK planner (PlannerAgentADK/) are deployed on their own, so
+each ships an identical copy of this module; tests/test_math_tools.py checks that the copies match.
+"""
+import ast
+import functools
+import operator
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+# Guards against expressions like '9 ** 9 ** 9' or '(9 ** 9999) ** 9999' that would tie up the
+# interpreter: exponents are capped, and so is the estimated size of every integer result. 14,000 bits
+# is about 4,200 decimal digits, below the 4,300-digit limit Python puts on converting an int to str,
+# so every accepted result can also be formatted.
+_MAX_EXPONENT = 10000
+_MAX_RESULT_BITS = 14_000
+# Characters that can appear in a plain arithmetic expression ('e'/'E' for scientific notation).
+ALLOWED_CHARS = frozenset("0123456789+-*/().%eE \t")
+
+def _eval(node: ast.AST) -> int | float:
+    """Evaluates a parsed arithmetic expression, allowing only numbers and arithmetic operators."""
+    if isinstance(node, ast.Expression):
+        return _eval(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        left = _eval(node.left)
+        right = _eval(node.right)
+        if isinstance(node.op, ast.Pow):
+            if abs(right) > _MAX_EXPONENT:
+                raise ValueError(f"Exponent {right} is too large.")
+            if isinstance(left, int) and isinstance(right, int) and abs(left).bit_length() * abs(right) > _MAX_RESULT_BITS:
+                raise ValueError("Result is too large.")
+        elif isinstance(node.op, ast.Mult):
+            if isinstance(left, int) and isinstance(right, int) and abs(left).bit_length() + abs(right).bit_length() > _MAX_RESULT_BITS:
+                raise ValueError("Result is too large.")
+        return _BINARY_OPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval(node.operand))
+    raise ValueError(f"Unsupported element in math expression: {type(node).__name__}")
+
+@functools.lru_cache(maxsize=1024)
+def _parse_expression(expression: str) -> ast.Expression:
+    """Parses an expression, caching the tree for expressions seen before."""
+    return ast.parse(expression, mode="eval")
+
+@functools.lru_cache(maxsize=1024)
+def _evaluate_expression(expression: str) -> int | float:
+    """Evaluates an expression. Evaluation is deterministic, so results are memoized."""
+    return _eval(_parse_expression(expression))
+
+def _normalize_expression(expression: str) -> str:
+    """Returns the canonical source of a parsed expression, so formatting variants like '5 + 3' and '5+3'
+    share cache entries. Parsing first means invalid input such as '5 * * 3' still raises SyntaxError."""
+    return ast.unparse(_parse_expression(expression.strip()))
+
+def evaluate_expression(expression: str) -> int | float:
+    """Evaluates a plain arithmetic expression; raises SyntaxError or ValueError if it cannot be solved."""
+    return _evaluate_expression(_normalize_expression(expression))
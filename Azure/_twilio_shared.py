@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import TYPE_CHECKING
+
+from env_loader import load_env_once
+
+# The Twilio SDK (and the requests/urllib3 stack under it) is only imported when the first
+# client is built, so agents that never send a message or place a call skip its import cost.
+if TYPE_CHECKING:
+    from twilio.http.http_client import TwilioHttpClient
+    from twilio.rest import Client
+
+logger = logging.getLogger(__name__)
+
+# A single Twilio client (and therefore a single pooled requests.Session) is shared by
+# SmsPlugin and CallsPlugin so back-to-back API calls reuse the same keep-alive connection.
+_client: "Client | None" = None
+_client_lock = threading.Lock()
+
+# Caps concurrent Twilio API requests so a burst of tool calls in one turn stays under
+# Twilio's concurrency limits instead of tripping 429s and backoff.
+TWILIO_MAX_CONCURRENCY = 4
+# An asyncio.Semaphore binds to the event loop that first waits on it, so each running loop gets
+# its own (e.g. successive asyncio.run calls, or a test loop); it goes away with its loop.
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_semaphores_lock = threading.Lock()
+
+TWILIO_TIMEOUT_SECONDS = 10
+
+
+def _build_http_client() -> "TwilioHttpClient":
+    """Builds a Twilio HTTP client backed by a pooled keep-alive requests.Session."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from twilio.http.http_client import TwilioHttpClient
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    # Retry only covers connection failures and idempotent requests (urllib3's default),
+    # so message/call creation POSTs are never sent twice.
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retries))
+    # Bound each request so a stalled Twilio connection cannot hang a tool call indefinitely.
+    http_client = TwilioHttpClient(timeout=TWILIO_TIMEOUT_SECONDS)
+    http_client.session = session
+    return http_client
+
+
+def get_client() -> "Client | None":
+    """Returns the shared Twilio client, creating it on first use.
+
+    Returns None if the Twilio credentials are not configured or the client fails to initialize.
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is not None:
+            return _client
+
+        load_env_once() # Ensure environment variables are loaded
+        account_sid = os.getenv("TWILIO_ACCOUNT_SID")
+        auth_token = os.getenv("TWILIO_AUTH_TOKEN")
+        if not account_sid or not auth_token:
+            return None
+
+        try:
+            from twilio.rest import Client
+            _client = Client(account_sid, auth_token, http_client=_build_http_client())
+            logger.info("Shared Twilio client initialized successfully.")
+        except Exception as e:
+            logger.error(f"Failed to initialize shared Twilio client: {e}")
+            _client = None
+        return _client
+
+
+def get_twilio_semaphore() -> asyncio.Semaphore:
+    """Returns the semaphore capping Twilio requests on the running event loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    with _semaphores_lock:
+        semaphore = _semaphores.get(loop)
+        if semaphore is None:
+            semaphore = _semaphores[loop] = asyncio.Semaphore(TWILIO_MAX_CONCURRENCY)
+        return semaphore
+
+
+def format_twilio_error(action: str, e: Exception) -> str:
+    """Builds a tool error message, flagging rate limits and Twilio server errors as worth retrying."""
+    # TwilioRestException carries the HTTP status; reading it via getattr avoids importing the SDK here.
+    status = getattr(e, "status", None)
+    if status == 429 or (isinstance(status, int) and status >= 500):
+        return f"Temporary Twilio error {action} (HTTP {status}); retrying later may succeed: {e}"
+    return f"Error {action}: {e}"
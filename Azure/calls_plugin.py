@@ -1,10 +1,12 @@
+import asyncio
 import logging
 import os
 from typing import Annotated
 
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
-from twilio.rest import Client
-from dotenv import load_dotenv
+
+from _twilio_shared import format_twilio_error, get_client, get_twilio_semaphore
+from env_loader import load_env_once
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +14,7 @@ class CallsPlugin:
     """Plugin to make voice calls using Twilio."""
 
     def __init__(self):
-        load_dotenv() # Ensure environment variables are loaded
+        load_env_once() # Ensure environment variables are loaded
         self._account_sid = os.getenv("TWILIO_ACCOUNT_SID")
         self._auth_token = os.getenv("TWILIO_AUTH_TOKEN")
         self._from_phone = os.getenv("TWILIO_FROM_PHONE")
@@ -22,14 +24,17 @@ class CallsPlugin:
                 "Twilio credentials (TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_FROM_PHONE) "
                 "not found in environment variables for CallsPlugin."
             )
-            self._client = None
-        else:
-            try:
-                self._client = Client(self._account_sid, self._auth_token)
+
+        # The Twilio client is created on the first call so that loading the plugin does not import the SDK.
+        self._client = None
+
+    def _get_client(self):
+        """Returns the shared Twilio client, creating it on first use."""
+        if self._client is None and all([self._account_sid, self._auth_token, self._from_phone]):
+            self._client = get_client()
+            if self._client:
                 logger.info("Twilio client for CallsPlugin initialized successfully.")
-            except Exception as e:
-                logger.error(f"Failed to initialize Twilio client for CallsPlugin: {e}")
-                self._client = None
+        return self._client
 
     @kernel_function(
         description="Make a voice call using the Twilio API.",
@@ -42,18 +47,22 @@ class CallsPlugin:
         # This URL points to a simple TwiML document that says "Hello from Twilio".
         voice_url: Annotated[str, "A URL pointing to TwiML instructions for the call. Defaults to a demo TwiML."] = "http://demo.twilio.com/docs/voice.xml"
     ) -> Annotated[str, "A message indicating success or failure of the call initiation."]:
-        if not self._client:
+        client = self._get_client()
+        if not client:
             error_msg = "Twilio client not initialized for CallsPlugin. Check credentials."
             logger.error(error_msg)
             return error_msg
         
-        logger.info(f"Attempting to make call to {to_phone} using TwiML at {voice_url}")
+        logger.info("Attempting to make call to %s using TwiML at %s", to_phone, voice_url)
         try:
-            call = self._client.calls.create(
-                to=to_phone,
-                from_=self._from_phone,
-                url=voice_url
-            )
+            # The Twilio SDK is synchronous; run it in a worker thread so the event loop is not blocked.
+            async with get_twilio_semaphore():
+                call = await asyncio.to_thread(
+                    client.calls.create,
+                    to=to_phone,
+                    from_=self._from_phone,
+                    url=voice_url
+                )
             if call.sid:
                 success_msg = f"Call initiated to {to_phone}. SID: {call.sid}"
                 logger.info(success_msg)
@@ -63,13 +72,12 @@ class CallsPlugin:
                 logger.error(error_msg)
                 return error_msg
         except Exception as e:
-            error_msg = f"Error making call to {to_phone}: {e}"
+            error_msg = format_twilio_error(f"making call to {to_phone}", e)
             logger.error(error_msg)
             return error_msg
 
 # Example usage (for testing the plugin directly - requires Twilio credentials in .env):
 if __name__ == "__main__":
-    import asyncio
     logging.basicConfig(level=logging.INFO) # Ensure logs are visible for direct test
 
     # --- Manual Test Setup ---
@@ -84,7 +92,7 @@ if __name__ == "__main__":
         print("Please set it in your .env file to test this plugin.")
     else:
         plugin = CallsPlugin()
-        if plugin._client: # Only run if client initialized
+        if plugin._get_client(): # Only run if client initialized
             async def run_call_test():
                 print("--- Testing CallsPlugin ---")
                 # Test making a call with default TwiML
@@ -1,11 +1,23 @@
+import asyncio
+import io
 import logging
+import mmap
 import os
+import threading
+from collections import OrderedDict
 from typing import Annotated
 
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
 
 logger = logging.getLogger(__name__)
 
+# Buffer size for write handles; a large write goes out in few write() syscalls.
+_WRITE_BUFFER_SIZE = 128 * 1024
+# Maximum number of append handles kept open at once; the least recently used one is closed first.
+_MAX_OPEN_APPENDERS = 32
+# Files at least this large are decoded straight from a memory map instead of being read into a buffer first.
+_MMAP_READ_THRESHOLD = 1024 * 1024
+
 class FileIOPlugin:
     """Plugin for performing file input/output operations."""
 
@@ -17,10 +29,16 @@ class FileIOPlugin:
                             Defaults to the current working directory.
         """
         self._base_directory = base_directory or os.getcwd()
+        # The base directory is fixed for the plugin's lifetime, so resolve it once.
+        self._base_real = os.path.realpath(self._base_directory)
         # Ensure base directory exists, create if not (optional, consider security implications)
         # if not os.path.exists(self._base_directory):
         #     os.makedirs(self._base_directory)
         #     logger.info(f"Created base directory: {self._base_directory}")
+        # Append handles are kept open and reused across append_to_file calls so repeated appends
+        # skip the open()/close() pair; each append is flushed, so nothing waits in memory.
+        self._append_handles: OrderedDict[str, io.BufferedWriter] = OrderedDict()
+        self._append_handles_lock = threading.Lock()
         logger.info(f"FileIOPlugin initialized with base directory: {self._base_directory}")
 
     def _get_safe_path(self, file_name: str) -> str | None:
@@ -30,41 +48,124 @@ class FileIOPlugin:
         if safe_file_name != file_name:
             logger.warning(f"Potentially unsafe file name '{file_name}' sanitized to '{safe_file_name}'.")
         
-        full_path = os.path.join(self._base_directory, safe_file_name)
+        full_path = os.path.join(self._base_real, safe_file_name)
         
-        # Final check to ensure the path is within the intended directory
-        if os.path.commonprefix([os.path.realpath(full_path), os.path.realpath(self._base_directory)]) != os.path.realpath(self._base_directory):
+        # Final check to ensure the path (after resolving symlinks) is within the intended directory
+        real_path = os.path.realpath(full_path)
+        if real_path != self._base_real and not real_path.startswith(self._base_real + os.sep):
             logger.error(f"Attempt to access path '{full_path}' outside of base directory '{self._base_directory}'. Denying operation.")
             return None
         return full_path
 
+    def _flush_append_handle(self, safe_path: str) -> None:
+        """Flushes any buffered appends for the path so readers see them."""
+        with self._append_handles_lock:
+            handle = self._append_handles.get(safe_path)
+            if handle:
+                handle.flush()
+
+    def _close_append_handle(self, safe_path: str) -> None:
+        """Flushes and closes the cached append handle for the path, if any."""
+        with self._append_handles_lock:
+            handle = self._append_handles.pop(safe_path, None)
+        if handle:
+            handle.close()
+
+    def close(self) -> None:
+        """Flushes and closes all cached append handles."""
+        with self._append_handles_lock:
+            safe_paths = list(self._append_handles)
+        for safe_path in safe_paths:
+            try:
+                self._close_append_handle(safe_path)
+            except Exception as e:
+                logger.error(f"Failed to close append handle for '{safe_path}': {e}")
+
+    def __del__(self):
+        self.close()
+
+    def _write_file(self, safe_path: str, content: str, durable: bool) -> None:
+        """Blocking write; run in a worker thread."""
+        self._close_append_handle(safe_path)
+        with open(safe_path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(content)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _append_file(self, safe_path: str, content: str) -> None:
+        """Blocking append through the cached handle; run in a worker thread."""
+        with self._append_handles_lock:
+            handle = self._append_handles.get(safe_path)
+            if handle is None:
+                if len(self._append_handles) >= _MAX_OPEN_APPENDERS:
+                    _, oldest = self._append_handles.popitem(last=False)
+                    oldest.close()
+                handle = open(safe_path, "ab")
+                self._append_handles[safe_path] = handle
+            else:
+                self._append_handles.move_to_end(safe_path)
+            handle.write(content.encode("utf-8"))
+            # Flushed on every call so readers and other processes see the appended content.
+            handle.flush()
+
+    def _read_file(self, safe_path: str) -> str:
+        """Blocking read; run in a worker thread."""
+        self._flush_append_handle(safe_path)
+        # Read raw bytes and decode once instead of going through the text I/O layer.
+        with open(safe_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size >= _MMAP_READ_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return str(mm, "utf-8")
+            return f.read().decode("utf-8")
+
+    def _delete_file(self, safe_path: str) -> None:
+        """Blocking delete; run in a worker thread."""
+        self._close_append_handle(safe_path)
+        os.remove(safe_path)
+
     @kernel_function(
         description="Writes content to a file, overwriting if it exists.",
         name="write_to_file"
     )
-    def write_to_file(
+    async def write_to_file(
         self, 
         file_name: Annotated[str, "The name of the file to write to (e.g., 'output.txt')."],
-        content: Annotated[str, "The content to write to the file."]
+        content: Annotated[str, "The content to write to the file."],
+        durable: Annotated[bool, "Whether to fsync the file to disk before returning."] = False
     ) -> Annotated[str, "A message indicating success or failure."]:
         logger.info(f"Attempting to write to file: {file_name}")
         safe_path = self._get_safe_path(file_name)
         if not safe_path:
             return "Failed to write to file: Invalid file path or access denied."
         try:
-            with open(safe_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            await asyncio.to_thread(self._write_file, safe_path, content, durable)
             logger.info(f"Content written to '{safe_path}'.")
             return f"Content written to '{file_name}'."
         except Exception as e:
             logger.error(f"Failed to write to file '{safe_path}': {e}")
             return f"Failed to write to file '{file_name}': {e}"
 
+    @kernel_function(
+        description="Writes several files at once, overwriting any that exist.",
+        name="write_files_batch"
+    )
+    async def write_files_batch(
+        self,
+        files: Annotated[list[tuple[str, str]], "A list of [file_name, content] pairs to write."]
+    ) -> Annotated[str, "One success or failure message per file."]:
+        logger.info(f"Attempting to write {len(files)} files in a batch.")
+        # The writes run concurrently so the disk round-trips overlap instead of queuing.
+        results = await asyncio.gather(
+            *(self.write_to_file(file_name, content) for file_name, content in files)
+        )
+        return "\n".join(results)
+
     @kernel_function(
         description="Appends content to a file.",
         name="append_to_file"
     )
-    def append_to_file(
+    async def append_to_file(
         self, 
         file_name: Annotated[str, "The name of the file to append to (e.g., 'log.txt')."],
         content: Annotated[str, "The content to append."]
@@ -74,8 +175,7 @@ class FileIOPlugin:
         if not safe_path:
             return "Failed to append to file: Invalid file path or access denied."
         try:
-            with open(safe_path, "a", encoding="utf-8") as f:
-                f.write(content)
+            await asyncio.to_thread(self._append_file, safe_path, content)
             logger.info(f"Content appended to '{safe_path}'.")
             return f"Content appended to '{file_name}'."
         except Exception as e:
@@ -86,7 +186,7 @@ class FileIOPlugin:
         description="Reads the content of a file.",
         name="read_file_content"
     )
-    def read_file(
+    async def read_file(
         self, 
         file_name: Annotated[str, "The name of the file to read (e.g., 'input.txt')."]
     ) -> Annotated[str, "The content of the file, or an error message."]:
@@ -95,13 +195,12 @@ class FileIOPlugin:
         if not safe_path:
             return "Failed to read file: Invalid file path or access denied."
         try:
-            if not os.path.exists(safe_path):
-                logger.warning(f"File '{safe_path}' does not exist for reading.")
-                return f"File '{file_name}' does not exist."
-            with open(safe_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = await asyncio.to_thread(self._read_file, safe_path)
             logger.info(f"Content read from '{safe_path}'.")
             return content
+        except FileNotFoundError:
+            logger.warning(f"File '{safe_path}' does not exist for reading.")
+            return f"File '{file_name}' does not exist."
         except Exception as e:
             logger.error(f"Failed to read file '{safe_path}': {e}")
             return f"Failed to read file '{file_name}': {e}"
@@ -110,7 +209,7 @@ class FileIOPlugin:
         description="Deletes a file.",
         name="delete_file_by_name"
     )
-    def delete_file(
+    async def delete_file(
         self, 
         file_name: Annotated[str, "The name of the file to delete (e.g., 'temp.txt')."]
     ) -> Annotated[str, "A message indicating success or failure."]:
@@ -119,61 +218,78 @@ class FileIOPlugin:
         if not safe_path:
             return "Failed to delete file: Invalid file path or access denied."
         try:
-            if not os.path.exists(safe_path):
-                logger.warning(f"File '{safe_path}' does not exist for deletion.")
-                return f"File '{file_name}' does not exist."
-            os.remove(safe_path)
+            await asyncio.to_thread(self._delete_file, safe_path)
             logger.info(f"File '{safe_path}' deleted.")
             return f"File '{file_name}' deleted."
+        except FileNotFoundError:
+            logger.warning(f"File '{safe_path}' does not exist for deletion.")
+            return f"File '{file_name}' does not exist."
         except Exception as e:
             logger.error(f"Failed to delete file '{safe_path}': {e}")
             return f"Failed to delete file '{file_name}': {e}"
 
 # Example usage (for testing the plugin directly):
 if __name__ == "__main__":
-    # Create a dummy directory for testing relative paths
-    test_dir = "_file_io_test_dir"
-    if not os.path.exists(test_dir):
-        os.makedirs(test_dir)
-
-    # Test with a base directory
-    print(f"--- Testing with base directory: {test_dir} ---")
-    plugin = FileIOPlugin(base_directory=test_dir)
-    
-    test_file = "test_file.txt"
-    print(plugin.write_to_file(test_file, "Hello from FileIOPlugin!\n"))
-    print(plugin.read_file(test_file))
-    print(plugin.append_to_file(test_file, "Appending some more text.\n"))
-    print(plugin.read_file(test_file))
-    # Test reading non-existent file
-    print(plugin.read_file("non_existent_file.txt"))
-    # Test deleting file
-    print(plugin.delete_file(test_file))
-    print(plugin.read_file(test_file)) # Should say it doesn't exist
-    # Test deleting non-existent file
-    print(plugin.delete_file("non_existent_file.txt"))
-
-    # Test unsafe paths
-    print("--- Testing unsafe paths ---")
-    print(plugin.write_to_file("../unsafe_test.txt", "This should not write outside."))
-    print(plugin.read_file("../../../../../../../../../../../../etc/hosts")) # Example of trying to read sensitive file
-
-    # Clean up the dummy directory
-    if os.path.exists(os.path.join(test_dir, "../unsafe_test.txt")):
-        os.remove(os.path.join(test_dir, "../unsafe_test.txt"))
-        print("Cleaned up unsafe_test.txt (this indicates a security flaw if it was created)")
-    
-    if os.path.exists(test_dir):
-        for f in os.listdir(test_dir):
-            os.remove(os.path.join(test_dir, f))
-        os.rmdir(test_dir)
-        print(f"Cleaned up test directory: {test_dir}")
-
-    # Test without a base directory (uses current working directory)
-    print("\n--- Testing with default base directory (current working directory) ---")
-    plugin_no_base = FileIOPlugin()
-    test_file_cwd = "test_file_cwd.txt"
-    print(plugin_no_base.write_to_file(test_file_cwd, "Hello in CWD!\n"))
-    print(plugin_no_base.read_file(test_file_cwd))
-    print(plugin_no_base.delete_file(test_file_cwd))
-    print(f"Cleaned up {test_file_cwd}") 
\ No newline at end of file
+    async def run_tests():
+        # Create a dummy directory for testing relative paths
+        test_dir = "_file_io_test_dir"
+        if not os.path.exists(test_dir):
+            os.makedirs(test_dir)
+
+        # Test with a base directory
+        print(f"--- Testing with base directory: {test_dir} ---")
+        plugin = FileIOPlugin(base_directory=test_dir)
+        
+        test_file = "test_file.txt"
+        print(await plugin.write_to_file(test_file, "Hello from FileIOPlugin!\n"))
+        print(await plugin.read_file(test_file))
+        print(await plugin.append_to_file(test_file, "Appending some more text.\n"))
+        print(await plugin.read_file(test_file))
+        # Test reading non-existent file
+        print(await plugin.read_file("non_existent_file.txt"))
+        # Test deleting file
+        print(await plugin.delete_file(test_file))
+        print(await plugin.read_file(test_file)) # Should say it doesn't exist
+        # Test deleting non-existent file
+        print(await plugin.delete_file("non_existent_file.txt"))
+
+        # Test unsafe paths
+        print("--- Testing unsafe paths ---")
+        print(await plugin.write_to_file("../unsafe_test.txt", "This should not write outside."))
+        print(await plugin.read_file("../../../../../../../../../../../../etc/hosts")) # Example of trying to read sensitive file
+        # A symlink into a sibling directory whose name shares the base directory's prefix
+        # (e.g. '/foo' vs '/foobar') must be denied as well.
+        sibling_dir = test_dir + "_sibling"
+        os.makedirs(sibling_dir, exist_ok=True)
+        with open(os.path.join(sibling_dir, "secret.txt"), "w", encoding="utf-8") as f:
+            f.write("This should not be readable through the plugin.")
+        try:
+            os.symlink(os.path.abspath(os.path.join(sibling_dir, "secret.txt")), os.path.join(test_dir, "sibling_link.txt"))
+            print(await plugin.read_file("sibling_link.txt"))
+        except OSError as e:
+            print(f"Skipping sibling symlink test: {e}")
+        os.remove(os.path.join(sibling_dir, "secret.txt"))
+        os.rmdir(sibling_dir)
+
+        # Clean up the dummy directory
+        if os.path.exists(os.path.join(test_dir, "../unsafe_test.txt")):
+            os.remove(os.path.join(test_dir, "../unsafe_test.txt"))
+            print("Cleaned up unsafe_test.txt (this indicates a security flaw if it was created)")
+        
+        plugin.close()
+        if os.path.exists(test_dir):
+            for f in os.listdir(test_dir):
+                os.remove(os.path.join(test_dir, f))
+            os.rmdir(test_dir)
+            print(f"Cleaned up test directory: {test_dir}")
+
+        # Test without a base directory (uses current working directory)
+        print("\n--- Testing with default base directory (current working directory) ---")
+        plugin_no_base = FileIOPlugin()
+        test_file_cwd = "test_file_cwd.txt"
+        print(await plugin_no_base.write_to_file(test_file_cwd, "Hello in CWD!\n"))
+        print(await plugin_no_base.read_file(test_file_cwd))
+        print(await plugin_no_base.delete_file(test_file_cwd))
+        print(f"Cleaned up {test_file_cwd}")
+
+    asyncio.run(run_tests())
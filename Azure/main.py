@@ -1,27 +1,278 @@
 import asyncio
+import functools
 import logging
 import os
-import json
+import sys
+import threading
 
-from dotenv import load_dotenv
+import httpx
+import orjson
+
+from openai import AsyncAzureOpenAI
 from semantic_kernel import Kernel
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
-from semantic_kernel.contents import ChatMessageContent, FunctionCallContent, FunctionResultContent
+from semantic_kernel.connectors.ai.prompt_execution_settings import PromptExecutionSettings
+from semantic_kernel.contents import ChatMessageContent, FunctionCallContent, FunctionResultContent, StreamingChatMessageContent
 from semantic_kernel.contents.chat_history import ChatHistory
 from semantic_kernel.functions.kernel_arguments import KernelArguments
+from semantic_kernel.functions.kernel_function import KernelFunction
 # Import plugins
 from math_plugin import MathPlugin
 from file_io_plugin import FileIOPlugin
 from sms_plugin import SmsPlugin
 from calls_plugin import CallsPlugin
+from env_loader import load_env_once
 
 # Load environment variables from .env file
-load_dotenv()
+load_env_once()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Basic type mapping from Python to JSON Schema
+_PY_TO_JSON = {
+    "str": "string",
+    "int": "integer",
+    "float": "number",
+    "Decimal": "number",
+    "bool": "boolean",
+    "list": "array",
+    "array": "array",
+    "dict": "object",
+    "object": "object",
+}
+_SEQUENCE_TYPES = frozenset({"list", "List", "set", "Set", "Sequence"})
+
+
+def _split_type_args(args: str) -> list[str]:
+    """Splits the arguments of a generic type name on its top-level commas ('str, list[int]' -> 2 parts)."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(args):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(args[start:i].strip())
+            start = i + 1
+    parts.append(args[start:].strip())
+    return parts
+
+
+def _type_schema(type_name: str) -> dict:
+    """Builds the JSON schema for a parameter type name such as 'int' or 'list[tuple[str, str]]'.
+
+    Lists and tuples become arrays with typed items, so the model sends e.g. [["a.txt", "hi"]] rather
+    than a string; unknown types default to string.
+    """
+    # 'str | None' and similar optionals are described by their non-None member.
+    members = [member.strip() for member in type_name.split("|") if member.strip() != "None"]
+    type_name = members[0] if len(members) == 1 else type_name
+    base, _, args = type_name.partition("[")
+    base = base.strip()
+    item_types = _split_type_args(args[:-1]) if args.endswith("]") else []
+    if base in _SEQUENCE_TYPES and item_types:
+        return {"type": "array", "items": _type_schema(item_types[0])}
+    if base in ("tuple", "Tuple") and item_types:
+        if len(item_types) == 2 and item_types[1] == "...":
+            return {"type": "array", "items": _type_schema(item_types[0])}
+        item_schemas = [_type_schema(item_type) for item_type in item_types]
+        schema = {"type": "array", "minItems": len(item_schemas), "maxItems": len(item_schemas)}
+        if all(item_schema == item_schemas[0] for item_schema in item_schemas):
+            schema["items"] = item_schemas[0]
+        return schema
+    return {"type": _PY_TO_JSON.get(base, "string")} # Default to string if unknown
+
+# With TERMINAL_TOOL_FAST_PATH=true, a turn whose only tool call is a terminal tool with a short result
+# shows that result directly instead of making a second LLM call. It is off by default because the model
+# cannot signal that it meant to use the result in a follow-up call (the finish reason of a tool call
+# response is always "tool_calls"), so the fast path would end such turns early.
+TERMINAL_TOOL_FAST_PATH = os.getenv("TERMINAL_TOOL_FAST_PATH", "false").strip().lower() == "true"
+# Tools whose short results are already a complete answer for the user.
+_TERMINAL_TOOLS = frozenset({"MathSolver_solve_math_expression"})
+_TERMINAL_RESULT_MAX_LENGTH = 120
+# Prefixes of failed tool results: "Error:" from _execute_tool_call, "Could not solve:" from MathPlugin.
+_TOOL_ERROR_PREFIXES = ("Error:", "Could not solve:")
+
+
+def _build_tools_schema(kernel: Kernel) -> list[dict]:
+    """Builds the OpenAI tools schema for every function registered on the kernel.
+
+    The plugin set is fixed after startup, so this only needs to run once.
+    """
+    tools = []
+    for plugin_name, plugin in kernel.plugins.items():
+        for function_name, function_metadata in plugin.functions.items():
+            # Format parameters according to OpenAI an JSON Schema spec
+            # https://json-schema.org/understanding-json-schema/reference/object.html#properties
+            # https://platform.openai.com/docs/guides/function-calling
+            function_params = {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+            for param in function_metadata.parameters:
+                param_type = param.type_ if param.type_ else "string"
+                function_params["properties"][param.name] = {
+                    **_type_schema(param_type),
+                    "description": param.description
+                }
+                if param.is_required:
+                    function_params["required"].append(param.name)
+
+            tools.append({
+                "type": "function",
+                "function": {
+                    "name": f"{plugin_name}_{function_metadata.name}", # Use underscore for OpenAI compatibility
+                    "description": function_metadata.description,
+                    "parameters": function_params
+                }
+            })
+    return tools
+
+
+def _build_tool_dispatch(kernel: Kernel) -> dict[str, KernelFunction]:
+    """Maps each OpenAI tool name (as produced by _build_tools_schema) to its kernel function."""
+    return {
+        f"{plugin_name}_{function.name}": function
+        for plugin_name, plugin in kernel.plugins.items()
+        for function in plugin.functions.values()
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_tool_args(arguments: str) -> dict:
+    """Decodes a tool call's JSON arguments. Repeated argument strings are served from the cache,
+    so callers must copy the returned dict before mutating it."""
+    return orjson.loads(arguments)
+
+
+def _get_terminal_result(
+    tool_calls: list[FunctionCallContent],
+    tool_messages: list[ChatMessageContent],
+) -> str | None:
+    """Returns the tool result if the turn can be answered without a second LLM call, else None.
+
+    Failed results are never returned, so the model gets the chance to explain or retry them.
+    """
+    if not TERMINAL_TOOL_FAST_PATH or len(tool_calls) != 1 or tool_calls[0].name not in _TERMINAL_TOOLS:
+        return None
+    result = tool_messages[0].items[0].result
+    if not isinstance(result, str) or len(result) >= _TERMINAL_RESULT_MAX_LENGTH or result.startswith(_TOOL_ERROR_PREFIXES):
+        return None
+    return result
+
+
+async def _stream_chat_response(
+    chat_service: AzureChatCompletion,
+    chat_history: ChatHistory,
+    settings: PromptExecutionSettings,
+) -> StreamingChatMessageContent | None:
+    """Streams a chat completion, printing text as it arrives.
+
+    Returns the combined message (including any tool call requests), or None if nothing was streamed.
+    """
+    full_response = None
+    async for chunk in chat_service.get_streaming_chat_message_contents(
+        chat_history=chat_history,
+        settings=settings
+    ):
+        if not chunk:
+            continue
+        message = chunk[0]
+        if message.content:
+            print(message.content, end="", flush=True)
+        full_response = message if full_response is None else full_response + message
+    return full_response
+
+def _start_stdin_reader(loop: asyncio.AbstractEventLoop) -> asyncio.Queue:
+    """Starts a long-lived daemon thread that feeds stdin lines into an asyncio queue.
+
+    An empty string is queued on EOF. The thread is a daemon so a pending read never blocks shutdown.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def read_lines():
+        while True:
+            line = sys.stdin.readline()
+            loop.call_soon_threadsafe(queue.put_nowait, line)
+            if not line:
+                break
+
+    threading.Thread(target=read_lines, name="stdin-reader", daemon=True).start()
+    return queue
+
+
+async def _read_user_input(queue: asyncio.Queue) -> str:
+    """Returns the next line typed by the user, raising EOFError once stdin is closed."""
+    line = await queue.get()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+
+async def _execute_tool_call(
+    kernel: Kernel,
+    tool_dispatch: dict[str, KernelFunction],
+    tool_call: FunctionCallContent,
+) -> ChatMessageContent:
+    """Runs a single tool call and returns the tool message to add to the chat history.
+
+    Errors are reported back to the model as the tool result rather than raised.
+    """
+    logger.info(f"Executing tool call: {tool_call.name} with ID: {tool_call.id}")
+    try:
+        # Parse arguments if they are a string
+        if isinstance(tool_call.arguments, dict):
+            # The arguments are already a dict (though API usually sends string)
+            tool_args = tool_call.arguments
+        else:
+            try:
+                tool_args = dict(_parse_tool_args(tool_call.arguments))
+            except orjson.JSONDecodeError:
+                # Fallback if arguments are not a valid JSON string (should ideally be)
+                # If it's a plain string not meant to be JSON, pass as is if your function expects that
+                # This part needs careful handling based on how functions are defined.
+                # For now, let's assume functions might expect a single string arg if not JSON.
+                tool_args = {"input": tool_call.arguments} # Or handle based on specific function needs
+                logger.warning(f"Tool call arguments for {tool_call.name} were not valid JSON. Attempting fallback.")
+
+        function = tool_dispatch.get(tool_call.name)
+        if function is None:
+            raise ValueError(f"Unknown tool '{tool_call.name}'")
+
+        # Invoke the function
+        # Ensure KernelArguments are correctly formed for the function call
+        kernel_args = KernelArguments(**tool_args)
+        result = await function.invoke(kernel, kernel_args)
+        
+        # Get the primary result value
+        raw_value = getattr(result, "value", result)
+        result_value = raw_value if isinstance(raw_value, str) else str(raw_value)
+
+        logger.info(f"Tool call {tool_call.name} result: {result_value}")
+        
+        # Build the tool result message for the chat history
+        tool_response_message_content = FunctionResultContent(id=tool_call.id, name=tool_call.name, result=result_value)
+        tool_chat_message = ChatMessageContent(
+            role="tool",
+            items=[tool_response_message_content],
+            metadata={"tool_call_id": tool_call.id} # Ensure metadata is at ChatMessageContent level too if needed
+        )
+        return tool_chat_message
+
+    except Exception as e:
+        logger.error(f"Error executing tool {tool_call.name}: {e}")
+        error_result = f"Error: {e}"
+        tool_response_message_content = FunctionResultContent(id=tool_call.id, name=tool_call.name, result=error_result)
+        tool_chat_message = ChatMessageContent(
+            role="tool",
+            items=[tool_response_message_content],
+            metadata={"tool_call_id": tool_call.id}
+        )
+        return tool_chat_message
+
 
 async def main():
     logger.info("======== Python Semantic Kernel Planner App ========")
@@ -36,10 +287,23 @@ async def main():
 
     kernel = Kernel()
 
+    # One pooled HTTP/2 client for the whole session, so the initial and post-tool LLM calls
+    # reuse the same TLS connection instead of paying a handshake each turn.
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=60.0),
+        timeout=30.0,
+    )
     chat_service = AzureChatCompletion(
         deployment_name=azure_openai_model_id,
         endpoint=azure_openai_endpoint,
         api_key=azure_openai_api_key,
+        async_client=AsyncAzureOpenAI(
+            api_key=azure_openai_api_key,
+            azure_endpoint=azure_openai_endpoint,
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-21"),
+            http_client=http_client,
+        ),
     )
     kernel.add_service(chat_service)
     logger.info(f"Kernel initialized with Azure OpenAI Chat Completion service (Deployment: {azure_openai_model_id}).")
@@ -54,9 +318,11 @@ async def main():
     kernel.add_plugin(FileIOPlugin(base_directory="app_io_files"), plugin_name="FileIO") 
     logger.info("FileIOPlugin loaded as FileIO. Files will be relative to 'app_io_files' directory.")
     # Ensure the directory for FileIOPlugin exists
-    if not os.path.exists("app_io_files"):
+    try:
         os.makedirs("app_io_files")
         logger.info("Created 'app_io_files' directory for FileIOPlugin.")
+    except FileExistsError:
+        pass
 
 
     # Twilio plugins require credentials. They will log errors if not configured.
@@ -88,9 +354,21 @@ async def main():
     )
 
 
-    print("User > ", end="")
+    # Get execution settings for the chat service and configure the tools once;
+    # the plugin set does not change for the lifetime of the session.
+    execution_settings = kernel.get_prompt_execution_settings_from_service_id(
+        service_id=chat_service.service_id,
+    )
+    execution_settings.tools = _build_tools_schema(kernel)
+    execution_settings.tool_choice = "auto"
+    tool_dispatch = _build_tool_dispatch(kernel)
+    logger.info(f"Configured {len(execution_settings.tools)} tools for the chat service.")
+
+    input_queue = _start_stdin_reader(asyncio.get_running_loop())
+
+    print("User > ", end="", flush=True)
     try:
-        while (user_input := await asyncio.to_thread(input)) :
+        while (user_input := await _read_user_input(input_queue)) :
             if user_input.lower() == "exit":
                 print("Exiting application.")
                 break
@@ -98,180 +376,63 @@ async def main():
             chat_history.add_user_message(user_input)
             logger.info(f"User input: {user_input}")
 
-            # Get execution settings for the chat service
-            execution_settings = kernel.get_prompt_execution_settings_from_service_id(
-                service_id=chat_service.service_id,
-            )
-            
-            # Configure tools for the chat service
-            tools = []
-            for plugin_name, plugin in kernel.plugins.items():
-                for function_name, function_metadata in plugin.functions.items():
-                    # Format parameters according to OpenAI an JSON Schema spec
-                    # https://json-schema.org/understanding-json-schema/reference/object.html#properties
-                    # https://platform.openai.com/docs/guides/function-calling
-                    function_params = {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                    # Basic type mapping from Python to JSON Schema
-                    def get_json_type(python_type_str):
-                        if python_type_str == "str":
-                            return "string"
-                        if python_type_str == "int":
-                            return "integer"
-                        if python_type_str == "float" or python_type_str == "Decimal":
-                            return "number"
-                        if python_type_str == "bool":
-                            return "boolean"
-                        if python_type_str == "list" or python_type_str == "array":
-                            return "array"
-                        if python_type_str == "dict" or python_type_str == "object":
-                            return "object"
-                        return "string"  # Default to string if unknown
-
-                    for param in function_metadata.parameters:
-                        param_type = param.type_ if param.type_ else "string"
-                        function_params["properties"][param.name] = {
-                            "type": get_json_type(param_type),
-                            "description": param.description
-                        }
-                        if param.is_required:
-                            function_params["required"].append(param.name)
-                    
-                    tools.append({
-                        "type": "function",
-                        "function": {
-                            "name": f"{plugin_name}_{function_metadata.name}", # Use underscore for OpenAI compatibility
-                            "description": function_metadata.description,
-                            "parameters": function_params
-                        }
-                    })
-            
-            # Set tools in execution settings
-            execution_settings.tools = tools
-            execution_settings.tool_choice = "auto"
-
-            print("Assistant > ", end="")
-            response = await chat_service.get_chat_message_contents(
-                chat_history=chat_history,
-                settings=execution_settings
-            )
-            
+            print("Assistant > ", end="", flush=True)
+            # Text is printed as it streams in; tool call requests are accumulated into the response.
+            response = await _stream_chat_response(chat_service, chat_history, execution_settings)
+
             if response:
-                # Assuming the first response in the list is the one we want
-                if isinstance(response, list) and len(response) > 0:
-                    # If the response contains tool calls, they will be in response[0].tool_calls
-                    # If it's a direct message, it will be in response[0].content
-                    # For now, we will just extract the primary content if available.
-                    # Proper tool call handling would require invoking the tools and sending results back.
-                    
-                    # Check for tool calls first by inspecting items in the ChatMessageContent
-                    tool_calls_present = False
-                    if hasattr(response[0], 'items') and response[0].items:
-                        for item in response[0].items:
-                            if isinstance(item, FunctionCallContent):
-                                tool_calls_present = True
-                                break
-                    
-                    if tool_calls_present:
-                        # Add the assistant's message containing the tool call requests to history
-                        chat_history.add_message(response[0])
-
-                        # Process each tool call
-                        for tool_call in response[0].items:
-                            if not isinstance(tool_call, FunctionCallContent):
-                                continue
-
-                            logger.info(f"Executing tool call: {tool_call.name} with ID: {tool_call.id}")
-                            try:
-                                # Parse arguments if they are a string
-                                try:
-                                    tool_args = json.loads(tool_call.arguments)
-                                except json.JSONDecodeError:
-                                    # Fallback if arguments are not a valid JSON string (should ideally be)
-                                    # Or if the arguments are already a dict (though API usually sends string)
-                                    if isinstance(tool_call.arguments, dict):
-                                        tool_args = tool_call.arguments
-                                    else: # If it's a plain string not meant to be JSON, pass as is if your function expects that
-                                          # This part needs careful handling based on how functions are defined.
-                                          # For now, let's assume functions might expect a single string arg if not JSON.
-                                        tool_args = {"input": tool_call.arguments} # Or handle based on specific function needs
-                                        logger.warning(f"Tool call arguments for {tool_call.name} were not valid JSON. Attempting fallback.")
-
-                                plugin_name, function_name = tool_call.name.split("_", 1)
-                                
-                                # Invoke the function
-                                # Ensure KernelArguments are correctly formed for the function call
-                                kernel_args = KernelArguments(**tool_args)
-                                result = await kernel.invoke(plugin_name=plugin_name, function_name=function_name, arguments=kernel_args)
-                                
-                                # Get the primary result value
-                                result_value = str(result.value) if result and hasattr(result, 'value') else str(result)
-
-                                logger.info(f"Tool call {tool_call.name} result: {result_value}")
-                                
-                                # Add tool result to chat history
-                                tool_response_message_content = FunctionResultContent(id=tool_call.id, name=tool_call.name, result=result_value)
-                                tool_chat_message = ChatMessageContent(
-                                    role="tool",
-                                    items=[tool_response_message_content],
-                                    metadata={"tool_call_id": tool_call.id} # Ensure metadata is at ChatMessageContent level too if needed
-                                )
-                                chat_history.add_message(tool_chat_message)
-
-                            except Exception as e:
-                                logger.error(f"Error executing tool {tool_call.name}: {e}")
-                                error_result = f"Error: {e}"
-                                tool_response_message_content = FunctionResultContent(id=tool_call.id, name=tool_call.name, result=error_result)
-                                tool_chat_message = ChatMessageContent(
-                                    role="tool",
-                                    items=[tool_response_message_content],
-                                    metadata={"tool_call_id": tool_call.id}
-                                )
-                                chat_history.add_message(tool_chat_message)
-                        
+                # Check for tool calls first by inspecting items in the ChatMessageContent
+                tool_calls = [item for item in response.items if isinstance(item, FunctionCallContent)]
+
+                if tool_calls:
+                    # Add the assistant's message containing the tool call requests to history
+                    chat_history.add_message(response)
+
+                    # Run the tool calls concurrently so their I/O overlaps, then add the results
+                    # to the history in the original order so it stays deterministic.
+                    tool_messages = await asyncio.gather(
+                        *(_execute_tool_call(kernel, tool_dispatch, tool_call) for tool_call in tool_calls)
+                    )
+                    for tool_message in tool_messages:
+                        chat_history.add_message(tool_message)
+
+                    # Fast path (TERMINAL_TOOL_FAST_PATH): a single successful call to a terminal tool with a
+                    # short result needs no summary from the model, so skip the second LLM round-trip.
+                    terminal_result = _get_terminal_result(tool_calls, tool_messages)
+                    if terminal_result is not None:
+                        full_message = f"Result: {terminal_result}"
+                        print(full_message)
+                        chat_history.add_assistant_message(full_message)
+                    else:
                         # Now that tool results are in history, call the model again to get the final response
                         logger.info("Calling LLM again with tool results.")
-                        final_response_messages = await chat_service.get_chat_message_contents(
-                            chat_history=chat_history,
-                            settings=execution_settings
-                        )
-
-                        if final_response_messages and isinstance(final_response_messages, list) and len(final_response_messages) > 0:
-                            if final_response_messages[0].content:
-                                full_message = str(final_response_messages[0].content)
-                                print(full_message)
-                                chat_history.add_assistant_message(full_message)
-                            else:
-                                full_message = "[Assistant did not provide content after tool execution]"
-                                print(full_message)
-                                # Potentially add the raw assistant message if needed
-                                # chat_history.add_message(final_response_messages[0]) 
+                        final_response = await _stream_chat_response(chat_service, chat_history, execution_settings)
+
+                        if final_response and final_response.content:
+                            full_message = str(final_response.content)
+                            print()
+                            chat_history.add_assistant_message(full_message)
+                        elif final_response:
+                            full_message = "[Assistant did not provide content after tool execution]"
+                            print(full_message)
                         else:
                             full_message = "[No response from assistant after tool execution]"
                             print(full_message)
 
-                    elif response[0].content:
-                        full_message = str(response[0].content)
-                        print(full_message)
-                        chat_history.add_assistant_message(full_message)
-                    else:
-                        full_message = "[No content or tool call in response]"
-                        print(full_message)
-                        # Add the raw response to history if it's not a standard message or tool call
-                        chat_history.add_message(response[0])
-
-                else: # If it's not a list but has content (should ideally be handled by the list case too)
+                elif response.content:
                     full_message = str(response.content)
-                    print(full_message)
+                    print()
                     chat_history.add_assistant_message(full_message)
-                
+                else:
+                    full_message = "[No content or tool call in response]"
+                    print(full_message)
+                    # Add the raw response to history if it's not a standard message or tool call
+                    chat_history.add_message(response)
+
                 logger.info(f"Assistant response: {full_message}")
 
 
-            print("User > ", end="")
+            print("User > ", end="", flush=True)
 
     except (KeyboardInterrupt, EOFError):
         print("\\nExiting application.")
@@ -279,6 +440,7 @@ async def main():
     finally:
         # Cleanup if necessary, e.g. if plugins have explicit close/dispose methods
         # For this example, our plugins don't require explicit cleanup beyond what Python's GC handles.
+        await http_client.aclose()
         logger.info("Application shutdown complete.")
 
 if __name__ == "__main__":
@@ -3,6 +3,8 @@ from typing import Annotated
 
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
 
+from _math_eval import ALLOWED_CHARS, evaluate_expression
+
 logger = logging.getLogger(__name__)
 
 class MathPlugin:
@@ -25,13 +27,13 @@ class MathPlugin:
             The result of the expression or an error message if solving fails.
         """
         logger.info(f"Solving math expression: {expression}")
+        # Cheap screen before parsing: anything beyond digits and arithmetic operators is rejected outright.
+        if not ALLOWED_CHARS.issuperset(expression):
+            logger.error(f"Error solving expression '{expression}': unsupported characters.")
+            return f"Could not solve: {expression}. Error: the expression may only contain numbers and arithmetic operators."
         try:
-            # WARNING: eval can be dangerous if the input is not sanitized.
-            # For a production app, consider using a safer math expression parser/evaluator.
-            # Example: ast.literal_eval for very simple expressions, or a dedicated library.
-            # For this example, we'll use eval for simplicity, assuming trusted input
-            # or that the LLM will provide safe expressions.
-            result = eval(expression)
+            # Parse and walk the AST instead of using eval, so only arithmetic can run.
+            result = evaluate_expression(expression)
             logger.info(f"Math expression result: {result}")
             return f"{expression} = {result}"
         except Exception as e:
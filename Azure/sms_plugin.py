@@ -1,18 +1,30 @@
+import asyncio
 import logging
 import os
+import time
 from typing import Annotated
 
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
-from twilio.rest import Client
-from dotenv import load_dotenv
+
+from _twilio_shared import format_twilio_error, get_client, get_twilio_semaphore
+from env_loader import load_env_once
 
 logger = logging.getLogger(__name__)
 
+# Twilio answers 429 Too Many Requests when the account's concurrency limit is hit; such
+# sends are retried with exponential backoff (0.5s, 1s, 2s) before giving up.
+_MAX_SEND_ATTEMPTS = 4
+_RATE_LIMIT_BACKOFF_SECONDS = 0.5
+
+# An identical message (same recipient, same text) sent again within this many seconds is suppressed,
+# e.g. when the model repeats a send_sms call after a retry. 0 disables the check.
+SMS_DEDUPE_WINDOW_SECONDS = 60
+
 class SmsPlugin:
     """Plugin to send SMS and MMS messages using Twilio."""
 
-    def __init__(self):
-        load_dotenv() # Ensure environment variables are loaded
+    def __init__(self, dedupe_window_seconds: float | None = None):
+        load_env_once() # Ensure environment variables are loaded
         self._account_sid = os.getenv("TWILIO_ACCOUNT_SID")
         self._auth_token = os.getenv("TWILIO_AUTH_TOKEN")
         self._from_phone = os.getenv("TWILIO_FROM_PHONE")
@@ -23,14 +35,41 @@ class SmsPlugin:
                 "not found in environment variables."
             )
             # You might raise an error here or disable the plugin functionality
-            self._client = None
-        else:
-            try:
-                self._client = Client(self._account_sid, self._auth_token)
+
+        # The Twilio client is created on the first send so that loading the plugin does not import the SDK.
+        self._client = None
+        # The dedupe window is deployment policy, so it comes from the constructor or the
+        # SMS_DEDUPE_WINDOW_SECONDS setting, never from the model's tool call.
+        if dedupe_window_seconds is None:
+            dedupe_window_seconds = float(os.getenv("SMS_DEDUPE_WINDOW_SECONDS", SMS_DEDUPE_WINDOW_SECONDS))
+        self._dedupe_window_seconds = dedupe_window_seconds
+        # Monotonic send times of recent messages, keyed by (recipient, normalized body), used to
+        # suppress duplicates within the dedupe window.
+        self._recent_sends: dict[tuple[str, str], float] = {}
+
+    def _get_client(self):
+        """Returns the shared Twilio client, creating it on first use."""
+        if self._client is None and all([self._account_sid, self._auth_token, self._from_phone]):
+            self._client = get_client()
+            if self._client:
                 logger.info("Twilio client initialized successfully.")
-            except Exception as e:
-                logger.error(f"Failed to initialize Twilio client: {e}")
-                self._client = None
+        return self._client
+
+    async def _create_message(self, client, **kwargs):
+        """Creates a Twilio message off the event loop, retrying when Twilio rate-limits the request."""
+        from twilio.base.exceptions import TwilioRestException
+
+        for attempt in range(_MAX_SEND_ATTEMPTS):
+            try:
+                # The Twilio SDK is synchronous; run it in a worker thread so the event loop is not blocked.
+                async with get_twilio_semaphore():
+                    return await asyncio.to_thread(client.messages.create, **kwargs)
+            except TwilioRestException as e:
+                if e.status != 429 or attempt == _MAX_SEND_ATTEMPTS - 1:
+                    raise
+                delay = _RATE_LIMIT_BACKOFF_SECONDS * 2 ** attempt
+                logger.warning(f"Twilio rate limit hit sending to {kwargs.get('to')}; retrying in {delay}s.")
+                await asyncio.sleep(delay)
 
     @kernel_function(
         description="Send an SMS text message using the Twilio API.",
@@ -41,14 +80,36 @@ class SmsPlugin:
         to_phone: Annotated[str, "The recipient's phone number in E.164 format (e.g., +1234567890)."], 
         message: Annotated[str, "The text message to send."]
     ) -> Annotated[str, "A message indicating success or failure of the SMS sending."]:
-        if not self._client:
+        client = self._get_client()
+        if not client:
             error_msg = "Twilio client not initialized. Check credentials."
             logger.error(error_msg)
             return error_msg
-        
-        logger.info(f"Attempting to send SMS to {to_phone} with message: '{message[:30]}...'")
+
+        dedupe_key = (to_phone, message.strip().lower())
+        reserved = False
+        if self._dedupe_window_seconds > 0:
+            now = time.monotonic()
+            # Drop entries that have aged out so the map stays small.
+            self._recent_sends = {
+                key: sent_at for key, sent_at in self._recent_sends.items()
+                if now - sent_at < self._dedupe_window_seconds
+            }
+            sent_at = self._recent_sends.get(dedupe_key)
+            if sent_at is not None:
+                duplicate_msg = f"Duplicate SMS to {to_phone} suppressed; the same message was sent {now - sent_at:.0f}s ago."
+                logger.info(duplicate_msg)
+                return duplicate_msg
+            # Reserved before awaiting the send, so an identical send started concurrently (e.g. by
+            # send_sms_batch) is suppressed too; the reservation is released if this send fails.
+            self._recent_sends[dedupe_key] = now
+            reserved = True
+
+        logger.info("Attempting to send SMS to %s with message: '%.30s...'", to_phone, message)
+        sent = False
         try:
-            twilio_message = self._client.messages.create(
+            twilio_message = await self._create_message(
+                client,
                 to=to_phone,
                 from_=self._from_phone,
                 body=message
@@ -56,6 +117,7 @@ class SmsPlugin:
             if twilio_message.sid:
                 success_msg = f"SMS sent to {to_phone}: '{message}'. SID: {twilio_message.sid}"
                 logger.info(success_msg)
+                sent = True
                 return success_msg
             else:
                 # This case might indicate an issue not caught by an exception, e.g. validation error from Twilio
@@ -64,9 +126,15 @@ class SmsPlugin:
                 return error_msg
 
         except Exception as e:
-            error_msg = f"Error sending SMS to {to_phone}: {e}"
+            error_msg = format_twilio_error(f"sending SMS to {to_phone}", e)
             logger.error(error_msg)
             return error_msg
+        finally:
+            if reserved:
+                if sent:
+                    self._recent_sends[dedupe_key] = time.monotonic()
+                else:
+                    self._recent_sends.pop(dedupe_key, None)
 
     @kernel_function(
         description="Send an MMS message with media using the Twilio API.",
@@ -78,14 +146,16 @@ class SmsPlugin:
         message: Annotated[str, "The text message to send with the media."], 
         media_url: Annotated[str, "A publicly accessible URL of the media to send (e.g., a .jpg, .png, .gif file)."]
     ) -> Annotated[str, "A message indicating success or failure of the MMS sending."]:
-        if not self._client:
+        client = self._get_client()
+        if not client:
             error_msg = "Twilio client not initialized. Check credentials."
             logger.error(error_msg)
             return error_msg
 
-        logger.info(f"Attempting to send MMS to {to_phone} with message: '{message[:30]}...' and media: {media_url}")
+        logger.info("Attempting to send MMS to %s with message: '%.30s...' and media: %s", to_phone, message, media_url)
         try:
-            twilio_message = self._client.messages.create(
+            twilio_message = await self._create_message(
+                client,
                 to=to_phone,
                 from_=self._from_phone,
                 body=message,
@@ -100,13 +170,29 @@ class SmsPlugin:
                 logger.error(error_msg)
                 return error_msg
         except Exception as e:
-            error_msg = f"Error sending MMS to {to_phone}: {e}"
+            error_msg = format_twilio_error(f"sending MMS to {to_phone}", e)
             logger.error(error_msg)
             return error_msg
 
+    @kernel_function(
+        description="Send the same SMS text message to several recipients at once using the Twilio API.",
+        name="send_sms_batch"
+    )
+    async def send_sms_batch_async(
+        self,
+        to_phones: Annotated[list[str], "The recipients' phone numbers in E.164 format (e.g., +1234567890)."],
+        message: Annotated[str, "The text message to send to every recipient."]
+    ) -> Annotated[str, "One success or failure message per recipient."]:
+        logger.info("Attempting to send SMS to %d recipients.", len(to_phones))
+        # The sends run concurrently, bounded by the shared Twilio semaphore, so a broadcast
+        # takes roughly one round-trip per batch of recipients instead of one per recipient.
+        results = await asyncio.gather(
+            *(self.send_sms_async(to_phone, message) for to_phone in to_phones)
+        )
+        return "\n".join(results)
+
 # Example usage (for testing the plugin directly - requires Twilio credentials in .env):
 if __name__ == "__main__":
-    import asyncio
     logging.basicConfig(level=logging.INFO) # Ensure logs are visible for direct test
 
     # --- Manual Test Setup ---
@@ -123,7 +209,7 @@ if __name__ == "__main__":
         print("Please set it in your .env file to test this plugin.")
     else:
         plugin = SmsPlugin()
-        if plugin._client: # Only run if client initialized
+        if plugin._get_client(): # Only run if client initialized
             async def run_tests():
                 print("--- Testing SMSPlugin ---")
                 # Test sending SMS
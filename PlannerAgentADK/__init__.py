@@ -1 +1,6 @@
-from .adk_planner_agent import root_agent 
\ No newline at end of file
+def __getattr__(name):
+    # The agent is built on first access to `root_agent` rather than when the package is imported.
+    if name == "root_agent":
+        from .adk_planner_agent import get_agent
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
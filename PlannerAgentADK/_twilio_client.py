@@ -0,0 +1,67 @@
+import functools
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from twilio.http.http_client import TwilioHttpClient
+    from twilio.rest import Client
+
+logger = logging.getLogger(__name__)
+
+# SmsTool and CallsTool share one Twilio client per set of credentials, and every client shares one
+# HTTP client, so SMS, MMS and voice requests all go through the same requests.Session and reuse its
+# keep-alive connections.
+_clients: dict[tuple[str, str], "Client"] = {}
+_clients_lock = threading.Lock()
+
+TWILIO_TIMEOUT_SECONDS = 10
+# Retries connection failures only, so message and call creation is never sent twice.
+TWILIO_MAX_RETRIES = 3
+TWILIO_MAX_KEEPALIVE_CONNECTIONS = 20
+
+
+@functools.cache
+def _get_http_client() -> "TwilioHttpClient":
+    """Returns the HTTP client shared by all Twilio clients, building its pooled session on first use."""
+    # Imported here so the Twilio SDK is only loaded once a tool actually needs it.
+    import requests
+    from requests.adapters import HTTPAdapter
+    from twilio.http.http_client import TwilioHttpClient
+
+    session = requests.Session()
+    # The retries live on this adapter: TwilioHttpClient mounts its own retrying adapter on the session
+    # it creates, and replacing that session below would otherwise drop them.
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_maxsize=TWILIO_MAX_KEEPALIVE_CONNECTIONS, max_retries=TWILIO_MAX_RETRIES),
+    )
+    http_client = TwilioHttpClient(timeout=TWILIO_TIMEOUT_SECONDS)
+    http_client.session = session
+    return http_client
+
+
+def get_twilio_client(account_sid: str, auth_token: str) -> "Client":
+    """Returns the shared Twilio client for the given credentials, creating it on first use."""
+    key = (account_sid, auth_token)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            from twilio.rest import Client
+            client = Client(account_sid, auth_token, http_client=_get_http_client())
+            _clients[key] = client
+            logger.info("Shared Twilio client initialized.")
+        return client
+
+
+def format_twilio_error(action: str, e: Exception) -> str:
+    """Builds a tool error message, flagging rate limits and Twilio server errors as worth retrying."""
+    # TwilioRestException carries the HTTP status; reading it via getattr avoids importing the SDK here.
+    status = getattr(e, "status", None)
+    if status == 429 or (isinstance(status, int) and status >= 500):
+        return f"Temporary Twilio error {action} (HTTP {status}); retrying later may succeed: {e}"
+    return f"Error {action}: {e}"
@@ -1,9 +1,10 @@
+import asyncio
 import logging
 import os
 from typing import Optional
-from twilio.rest import Client
-from twilio.base.exceptions import TwilioRestException
-from dotenv import load_dotenv
+
+from ._twilio_client import format_twilio_error, get_twilio_client
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -11,10 +12,10 @@ class CallsTool:
     """Tool for making phone calls via Twilio."""
 
     def __init__(self):
-        load_dotenv() # Ensure environment variables are loaded
-        self._account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-        self._auth_token = os.getenv("TWILIO_AUTH_TOKEN")
-        self._from_phone = os.getenv("TWILIO_FROM_PHONE")
+        settings = get_settings()
+        self._account_sid = settings.twilio_account_sid
+        self._auth_token = settings.twilio_auth_token
+        self._from_phone = settings.twilio_from_phone
         self._client = None
 
         if not all([self._account_sid, self._auth_token, self._from_phone]):
@@ -22,12 +23,17 @@ class CallsTool:
                 "Twilio credentials (TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_FROM_PHONE) "
                 "not fully found in environment variables for CallsTool. Tool will not function."
             )
-        else:
+
+    @property
+    def client(self):
+        """Fetches the shared Twilio client on first use so the SDK is only imported when a call is made."""
+        if self._client is None and all([self._account_sid, self._auth_token, self._from_phone]):
             try:
-                self._client = Client(self._account_sid, self._auth_token)
+                self._client = get_twilio_client(self._account_sid, self._auth_token)
                 logger.info("Twilio client for CallsTool initialized successfully.")
             except Exception as e:
                 logger.error(f"Failed to initialize Twilio client for CallsTool: {e}")
+        return self._client
 
     async def make_call(
         self, 
@@ -35,14 +41,17 @@ class CallsTool:
         voice_url: str = "http://demo.twilio.com/docs/voice.xml"
     ) -> str:
         """Make a voice call using the Twilio API."""
-        if not self._client:
+        client = self.client
+        if not client:
             error_msg = "CallsTool: Twilio client not initialized. Check credentials and logs."
             logger.error(error_msg)
             return error_msg
         
-        logger.info(f"CallsTool: Attempting to make call to {to_phone} using TwiML at {voice_url}")
+        logger.info("CallsTool: Attempting to make call to %s using TwiML at %s", to_phone, voice_url)
         try:
-            call = self._client.calls.create(
+            # The Twilio SDK is synchronous; run it in a worker thread so the event loop is not blocked.
+            call = await asyncio.to_thread(
+                client.calls.create,
                 to=to_phone,
                 from_=self._from_phone,
                 url=voice_url
@@ -52,18 +61,17 @@ class CallsTool:
                 logger.info(success_msg)
                 return success_msg
             else:
-                error_details = call.error_message if hasattr(call, 'error_message') and call.error_message else 'Unknown Twilio error'
+                error_details = getattr(call, 'error_message', None) or 'Unknown Twilio error'
                 error_msg = f"Failed to initiate call to {to_phone}. Twilio response: {error_details}"
                 logger.error(error_msg)
                 return error_msg
         except Exception as e:
-            error_msg = f"Error making call to {to_phone}: {e}"
+            error_msg = format_twilio_error(f"making call to {to_phone}", e)
             logger.error(error_msg)
             return error_msg
 
 # Example usage (for testing the tool directly - requires Twilio credentials in .env):
 if __name__ == "__main__":
-    import asyncio
     logging.basicConfig(level=logging.INFO)
 
     test_to_phone = os.getenv("TEST_RECIPIENT_PHONE")
@@ -74,7 +82,7 @@ if __name__ == "__main__":
         print("Skipping CallsTool test: TEST_RECIPIENT_PHONE environment variable not set.")
     else:
         tool = CallsTool()
-        if tool._client: 
+        if tool.client:
             async def run_call_test():
                 print("--- Testing CallsTool ---")
                 call_result_default = await tool.make_call(to_phone=test_to_phone)
@@ -1,8 +1,21 @@
+import asyncio
 import logging
+import mmap
 import os
+import threading
+from collections import OrderedDict
+from typing import TextIO
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of append handles kept open at once; the least recently used one is closed first.
+_MAX_OPEN_APPENDERS = 32
+# Files at least this large are decoded straight from a memory map instead of being read into a buffer first.
+_MMAP_READ_THRESHOLD = 1024 * 1024
+# Base directories already prepared by an earlier FileIOTool, mapped to their resolved real
+# paths, so later instances for the same directory skip the filesystem work entirely.
+_prepared_dirs: dict[str, str] = {}
+
 class FileIOTool:
     """Tool for performing file input/output operations."""
 
@@ -20,21 +33,36 @@ class FileIOTool:
         else:
             self._base_directory = base_directory
         
-        if not os.path.exists(self._base_directory):
+        base_abs = os.path.abspath(self._base_directory)
+        if base_abs not in _prepared_dirs:
             try:
-                os.makedirs(self._base_directory)
-                logger.info(f"Created base directory for FileIOTool: {self._base_directory}")
+                # exist_ok makes this a single call that both checks for and creates the directory.
+                os.makedirs(base_abs, exist_ok=True)
+                _prepared_dirs[base_abs] = os.path.realpath(base_abs)
+                logger.info(f"Prepared base directory for FileIOTool: {self._base_directory}")
             except OSError as e:
                 logger.error(f"Failed to create base directory {self._base_directory}: {e}")
                 # Depending on desired behavior, you might want to raise an error here
                 # or ensure all file operations will fail gracefully.
                 # For now, we log and proceed, operations will likely fail if dir doesn't exist.
 
+        # The base directory is fixed for the tool's lifetime, so it is resolved once.
+        self._base_real = _prepared_dirs.get(base_abs) or os.path.realpath(base_abs)
+        self._base_ready = base_abs in _prepared_dirs
+
+        # Append handles are kept open across append_to_file calls so repeated appends
+        # skip the open()/close() pair; see _get_appender.
+        self._open_appenders: OrderedDict[str, TextIO] = OrderedDict()
+        self._appenders_lock = threading.Lock()
+
         logger.info(f"FileIOTool initialized with base directory: {self._base_directory}")
 
     def _get_safe_path(self, file_name: str) -> str | None:
         """Constructs a safe file path and ensures it's within the base directory."""
-        if not self._base_directory or not os.path.exists(self._base_directory):
+        if not self._base_ready:
+            # Re-check in case the directory was created after the tool was initialized.
+            self._base_ready = os.path.isdir(self._base_real)
+        if not self._base_ready:
             logger.error(f"Base directory '{self._base_directory}' does not exist or is not set. Cannot perform file operations.")
             return None
 
@@ -46,12 +74,84 @@ class FileIOTool:
         full_path = os.path.join(self._base_directory, safe_file_name)
         
         # Final check to ensure the path is within the intended directory
-        # os.path.realpath resolves symlinks, which is good for security.
-        if os.path.commonprefix([os.path.realpath(full_path), os.path.realpath(self._base_directory)]) != os.path.realpath(self._base_directory):
+        # os.path.realpath resolves symlinks, which is good for security. commonpath compares
+        # whole path segments, so a sibling like '/tmp/foobar' does not pass for '/tmp/foo'.
+        if os.path.commonpath([os.path.realpath(full_path), self._base_real]) != self._base_real:
             logger.error(f"Attempt to access path '{full_path}' outside of base directory '{self._base_directory}'. Denying operation.")
             return None
         return full_path
 
+    def _open_for_writing(self, safe_path: str, mode: str, **kwargs) -> TextIO:
+        """Opens a file for writing, recreating the base directory if it was deleted after being prepared."""
+        try:
+            return open(safe_path, mode, encoding="utf-8", **kwargs)
+        except FileNotFoundError:
+            # _prepared_dirs only records that the directory existed once, so check again before giving up.
+            if os.path.isdir(self._base_real):
+                raise
+            os.makedirs(self._base_real, exist_ok=True)
+            logger.warning(f"Base directory '{self._base_directory}' was missing and has been recreated.")
+            return open(safe_path, mode, encoding="utf-8", **kwargs)
+
+    def _has_current_appender(self, safe_path: str) -> bool:
+        """Returns True if a cached append handle for the path still refers to the file at that path.
+
+        A handle whose file was deleted or replaced outside the tool would keep writing to the old,
+        unlinked inode, so it is closed instead and the caller opens the path afresh.
+        """
+        with self._appenders_lock:
+            handle = self._open_appenders.get(safe_path)
+            if handle is None:
+                return False
+            try:
+                open_stat = os.fstat(handle.fileno())
+                path_stat = os.stat(safe_path)
+                if (open_stat.st_ino, open_stat.st_dev) == (path_stat.st_ino, path_stat.st_dev):
+                    return True
+            except OSError:
+                pass
+            del self._open_appenders[safe_path]
+        logger.info(f"File '{safe_path}' changed outside the tool; reopening it for appends.")
+        try:
+            handle.close()
+        except OSError as e:
+            logger.error(f"Failed to close append handle '{safe_path}': {e}")
+        return False
+
+    def _get_appender(self, safe_path: str) -> TextIO:
+        """Returns an open append handle for the path, opening it (and evicting the oldest) if needed."""
+        handle = self._open_appenders.get(safe_path)
+        if handle is not None:
+            self._open_appenders.move_to_end(safe_path)
+            return handle
+        if len(self._open_appenders) >= _MAX_OPEN_APPENDERS:
+            _, oldest = self._open_appenders.popitem(last=False)
+            oldest.close()
+        handle = self._open_for_writing(safe_path, "a", buffering=8192)
+        self._open_appenders[safe_path] = handle
+        return handle
+
+    def _close_appender(self, safe_path: str) -> None:
+        """Closes the cached append handle for the path, if any."""
+        with self._appenders_lock:
+            handle = self._open_appenders.pop(safe_path, None)
+        if handle is not None:
+            handle.close()
+
+    def close(self) -> None:
+        """Flushes and closes all cached append handles."""
+        with self._appenders_lock:
+            handles = list(self._open_appenders.values())
+            self._open_appenders.clear()
+        for handle in handles:
+            try:
+                handle.close()
+            except Exception as e:
+                logger.error(f"Failed to close append handle '{handle.name}': {e}")
+
+    def __del__(self):
+        self.close()
+
     def write_to_file(
         self, 
         file_name: str,
@@ -63,7 +163,8 @@ class FileIOTool:
         if not safe_path:
             return "Failed to write to file: Invalid file path, access denied, or base directory issue."
         try:
-            with open(safe_path, "w", encoding="utf-8") as f:
+            self._close_appender(safe_path)
+            with self._open_for_writing(safe_path, "w") as f:
                 f.write(content)
             logger.info(f"Content written to '{safe_path}'.")
             return f"Content written to '{file_name}' in directory '{os.path.basename(self._base_directory)}'."
@@ -78,12 +179,21 @@ class FileIOTool:
     ) -> str:
         """Appends content to a file."""
         logger.info(f"Attempting to append to file: {file_name}")
-        safe_path = self._get_safe_path(file_name)
-        if not safe_path:
-            return "Failed to append to file: Invalid file path, access denied, or base directory issue."
+        safe_path = os.path.join(self._base_directory, file_name)
+        # A path with a cached handle already passed _get_safe_path when the handle was opened, so
+        # repeated appends skip resolving it again as long as the handle still refers to the file at
+        # that path; anything else (including names that are not a bare file name, and files deleted
+        # or replaced since) goes through the full check.
+        if os.path.basename(file_name) != file_name or not self._has_current_appender(safe_path):
+            safe_path = self._get_safe_path(file_name)
+            if not safe_path:
+                return "Failed to append to file: Invalid file path, access denied, or base directory issue."
         try:
-            with open(safe_path, "a", encoding="utf-8") as f:
+            with self._appenders_lock:
+                f = self._get_appender(safe_path)
                 f.write(content)
+                # Flushed on every call so readers and other processes see the appended content.
+                f.flush()
             logger.info(f"Content appended to '{safe_path}'.")
             return f"Content appended to '{file_name}' in directory '{os.path.basename(self._base_directory)}'."
         except Exception as e:
@@ -100,13 +210,18 @@ class FileIOTool:
         if not safe_path:
             return "Failed to read file: Invalid file path, access denied, or base directory issue."
         try:
-            if not os.path.exists(safe_path):
-                logger.warning(f"File '{safe_path}' does not exist for reading.")
-                return f"File '{file_name}' does not exist in directory '{os.path.basename(self._base_directory)}'."
-            with open(safe_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            # Read raw bytes and decode once instead of going through the text I/O layer.
+            with open(safe_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size >= _MMAP_READ_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        content = str(mm, "utf-8")
+                else:
+                    content = f.read().decode("utf-8")
             logger.info(f"Content read from '{safe_path}'.")
             return content
+        except FileNotFoundError:
+            logger.warning(f"File '{safe_path}' does not exist for reading.")
+            return f"File '{file_name}' does not exist in directory '{os.path.basename(self._base_directory)}'."
         except Exception as e:
             logger.error(f"Failed to read file '{safe_path}': {e}")
             return f"Failed to read file '{file_name}': {e}"
@@ -121,16 +236,49 @@ class FileIOTool:
         if not safe_path:
             return "Failed to delete file: Invalid file path, access denied, or base directory issue."
         try:
-            if not os.path.exists(safe_path):
-                logger.warning(f"File '{safe_path}' does not exist for deletion.")
-                return f"File '{file_name}' does not exist in directory '{os.path.basename(self._base_directory)}'."
+            self._close_appender(safe_path)
             os.remove(safe_path)
             logger.info(f"File '{safe_path}' deleted.")
             return f"File '{file_name}' deleted from directory '{os.path.basename(self._base_directory)}'."
+        except FileNotFoundError:
+            logger.warning(f"File '{safe_path}' does not exist for deletion.")
+            return f"File '{file_name}' does not exist in directory '{os.path.basename(self._base_directory)}'."
         except Exception as e:
             logger.error(f"Failed to delete file '{safe_path}': {e}")
             return f"Failed to delete file '{file_name}': {e}"
 
+    # Async variants for callers running on an event loop; the blocking disk I/O runs in a
+    # worker thread so other coroutines (LLM and Twilio requests) keep making progress.
+    async def write_to_file_async(
+        self, 
+        file_name: str,
+        content: str
+    ) -> str:
+        """Writes content to a file, overwriting if it exists."""
+        return await asyncio.to_thread(self.write_to_file, file_name, content)
+
+    async def append_to_file_async(
+        self, 
+        file_name: str,
+        content: str
+    ) -> str:
+        """Appends content to a file."""
+        return await asyncio.to_thread(self.append_to_file, file_name, content)
+
+    async def read_file_content_async(
+        self, 
+        file_name: str
+    ) -> str:
+        """Reads the content of a file."""
+        return await asyncio.to_thread(self.read_file_content, file_name)
+
+    async def delete_file_by_name_async(
+        self, 
+        file_name: str
+    ) -> str:
+        """Deletes a file."""
+        return await asyncio.to_thread(self.delete_file_by_name, file_name)
+
 # Example usage (for testing the tool directly):
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
@@ -158,6 +306,15 @@ if __name__ == "__main__":
     # Test deleting non-existent file
     print(tool.delete_file_by_name("ghost_file.txt"))
 
+    # Test the async variants
+    async def run_async_tests():
+        print(await tool.write_to_file_async(test_file, "Hello from the async ADK FileIOTool!\n"))
+        print(await tool.append_to_file_async(test_file, "Appending asynchronously.\n"))
+        print(f"Read content (async): {await tool.read_file_content_async(test_file)}")
+        print(await tool.delete_file_by_name_async(test_file))
+    asyncio.run(run_async_tests())
+    tool.close()
+
     # Test unsafe paths
     print("--- Testing unsafe paths (should be denied) ---")
     # Attempt to write outside the designated test_dir. 
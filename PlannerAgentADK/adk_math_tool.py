@@ -1,5 +1,7 @@
 import logging
 
+from ._math_eval import ALLOWED_CHARS, evaluate_expression
+
 # ADK does not use @kernel_function, it infers from docstrings and type hints.
 # However, for complex argument descriptions, the google.adk.tools.tool decorator can be used.
 # For simplicity here, we'll rely on docstrings and standard type hints.
@@ -18,13 +20,13 @@ def solve_math_expression(
         The result of the expression or an error message if solving fails.
     """
     logger.info(f"Solving math expression: {expression}")
+    # Cheap screen before parsing: anything beyond digits and arithmetic operators is rejected outright.
+    if not ALLOWED_CHARS.issuperset(expression):
+        logger.error(f"Error solving expression '{expression}': unsupported characters.")
+        return f"Could not solve: {expression}. Error: the expression may only contain numbers and arithmetic operators."
     try:
-        # WARNING: eval can be dangerous if the input is not sanitized.
-        # For a production app, consider using a safer math expression parser/evaluator.
-        # Example: ast.literal_eval for very simple expressions, or a dedicated library.
-        # For this example, we'll use eval for simplicity, assuming trusted input
-        # or that the LLM will provide safe expressions.
-        result = eval(expression)
+        # Parse and walk the AST instead of using eval, so only arithmetic can run.
+        result = evaluate_expression(expression)
         logger.info(f"Math expression result: {result}")
         return f"{expression} = {result}"
     except Exception as e:
@@ -1,7 +1,9 @@
+import functools
+from importlib import resources
+import inspect
 import logging
 import os
-
-from dotenv import load_dotenv
+from pathlib import Path
 
 # ADK Components
 from google.adk.agents import LlmAgent
@@ -12,114 +14,151 @@ from .adk_math_tool import solve_math_expression
 from .adk_file_io_tool import FileIOTool
 from .adk_sms_tool import SmsTool
 from .adk_calls_tool import CallsTool
+from .config import get_settings
+from .env_loader import load_env_once
+from .tool_schema_cache import make_function_tool
 
 # Load environment variables from .env file (especially for TWILIO and GOOGLE_CLOUD_PROJECT/LOCATION)
-load_dotenv()
+load_env_once()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Logging is configured by the application (adk web/run or the __main__ block below), not on import.
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 # --- Initialize Tools (Globally) ---
 # Math tool is a direct function
 math_tool = solve_math_expression # Direct function reference
 
-# FileIO tool needs instantiation to set the base directory
-# We want to use the same 'app_io_files' directory as the original Azure app for consistency
-file_io_base_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app_io_files") # Path relative to this file's location
-if not os.path.exists(file_io_base_dir):
-    os.makedirs(file_io_base_dir)
-    logger.info(f"Created base directory for FileIOTool: {file_io_base_dir}")
-file_tool_instance = FileIOTool(base_directory=file_io_base_dir)
-
-# Twilio tools also need instantiation
-sms_tool_instance = SmsTool()
-calls_tool_instance = CallsTool()
-
-# Explicitly create FunctionTool instances for each method
-file_io_tools = [
-    FunctionTool(func=file_tool_instance.write_to_file),
-    FunctionTool(func=file_tool_instance.append_to_file),
-    FunctionTool(func=file_tool_instance.read_file_content),
-    FunctionTool(func=file_tool_instance.delete_file_by_name),
-]
-
-sms_tools = [
-    FunctionTool(func=sms_tool_instance.send_sms),
-    FunctionTool(func=sms_tool_instance.send_mms),
-]
-
-calls_tools = [
-    FunctionTool(func=calls_tool_instance.make_call),
-]
-
-all_tools = [
-    FunctionTool(func=math_tool) # Ensure math_tool is also wrapped if it's a function reference
-    ] + file_io_tools + sms_tools + calls_tools
-
-# --- Configure and Define the Global LLM Agent ---
-# Check for Google AI Studio configuration first
-google_api_key = os.getenv("GOOGLE_API_KEY")
-use_vertex_ai_env = os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "FALSE").upper() # Default to FALSE
-
-llm_model_name = "gemini-2.5-flash-preview-05-20" # A good default
-
-if use_vertex_ai_env == "FALSE" and google_api_key:
-    logger.info(f"Configuring LlmAgent for Google AI Studio with API Key using model: {llm_model_name}.")
-elif use_vertex_ai_env == "TRUE":
-    project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
-    location = os.getenv("GOOGLE_CLOUD_LOCATION")
-    if not project_id or not location:
-        logger.error(
-            "GOOGLE_GENAI_USE_VERTEXAI is TRUE, but GOOGLE_CLOUD_PROJECT or GOOGLE_CLOUD_LOCATION "
-            "environment variables are not set. LLM agent will likely fail to initialize."
-        )
-        # Potentially raise an error or set agent to None to prevent partial initialization
+# We want to use the same 'app_io_files' directory as the original Azure app for consistency.
+# Building the path is pure string work; it is only resolved on disk when the file tool is first used.
+_APP_IO_DIR = Path(__file__).parent.parent / "app_io_files"
+
+# The file, SMS and call tools are only instantiated the first time one of their methods is
+# called, so sessions that never use them skip the directory setup and Twilio configuration.
+@functools.cache
+def _get_file_tool() -> FileIOTool:
+    file_io_base_dir = _APP_IO_DIR.resolve()
+    file_io_base_dir.mkdir(parents=True, exist_ok=True) # One call, and no race with other workers creating it
+    return FileIOTool(base_directory=str(file_io_base_dir))
+
+@functools.cache
+def _get_sms_tool() -> SmsTool:
+    return SmsTool()
+
+@functools.cache
+def _get_calls_tool() -> CallsTool:
+    return CallsTool()
+
+def _lazy_method(get_instance, method, name: str | None = None):
+    """Wraps an unbound tool method so that its instance is created on the first call.
+
+    The wrapper keeps the method's name, docstring and signature (minus `self`), so
+    FunctionTool describes it to the LLM exactly as it would the bound method. `name`
+    overrides the tool name, e.g. to expose an `*_async` variant under its sync name.
+    """
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            return await method(get_instance(), *args, **kwargs)
     else:
-        logger.info(f"Configuring LlmAgent for Vertex AI in {project_id}/{location} using model: {llm_model_name}.")
-else:
-    logger.error(
-        "LLM configuration is unclear or incomplete. "
-        "For Google AI Studio: set GOOGLE_GENAI_USE_VERTEXAI=FALSE and provide GOOGLE_API_KEY. "
-        "For Vertex AI: set GOOGLE_GENAI_USE_VERTEXAI=TRUE (or leave unset) and provide GOOGLE_CLOUD_PROJECT & GOOGLE_CLOUD_LOCATION."
-    )
-    # Potentially raise an error or set agent to None
-
-planner_instruction = (
-    "You are a helpful AI assistant. You have a variety of tools available. "
-    "When a user asks for something, first consider if any of your tools can help. "
-    "If so, call the appropriate tool(s) by outputting a function call. "
-    "If not, respond directly to the user. "
-    "When using tools, the results will be provided to you. Use these results to formulate your final response to the user. "
-    "Available tools can solve math, perform file operations (read, write, append, delete in a specific directory), send SMS/MMS, and make calls."
-)
-
-# Define the root_agent globally
-try:
-    root_agent = LlmAgent(
-        model=llm_model_name,
-        name="GlobalPlannerAgent", # Ensure this name is unique if running multiple agents
-        description="A helpful assistant that can use tools for math, files, SMS, and calls.",
-        instruction=planner_instruction,
-        tools=all_tools
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            return method(get_instance(), *args, **kwargs)
+    if name is not None:
+        wrapper.__name__ = wrapper.__qualname__ = name
+    signature = inspect.signature(method)
+    wrapper.__signature__ = signature.replace(parameters=list(signature.parameters.values())[1:])
+    return wrapper
+
+# The instruction text lives in planner_instruction.txt so it can be edited without touching code.
+@functools.cache
+def load_planner_instruction() -> str:
+    """Reads the planner instruction from planner_instruction.txt on first call."""
+    return resources.files(__package__).joinpath("planner_instruction.txt").read_text(encoding="utf-8").rstrip("\n")
+
+def _tool_functions() -> tuple:
+    """Returns the functions exposed to the agent as tools."""
+    return (
+        math_tool,
+        # The async file variants run the disk I/O in a worker thread, so a slow disk does not stall
+        # the event loop that also serves the LLM and Twilio requests.
+        _lazy_method(_get_file_tool, FileIOTool.write_to_file_async, name="write_to_file"),
+        _lazy_method(_get_file_tool, FileIOTool.append_to_file_async, name="append_to_file"),
+        _lazy_method(_get_file_tool, FileIOTool.read_file_content_async, name="read_file_content"),
+        _lazy_method(_get_file_tool, FileIOTool.delete_file_by_name_async, name="delete_file_by_name"),
+        _lazy_method(_get_sms_tool, SmsTool.send_sms),
+        _lazy_method(_get_sms_tool, SmsTool.send_mms),
+        _lazy_method(_get_calls_tool, CallsTool.make_call),
     )
-    logger.info(f"GlobalPlannerAgent initialized with model '{llm_model_name}'.")
-except Exception as e:
-    logger.error(f"Failed to initialize LlmAgent globally: {e}")
-    logger.error(
-        "Please ensure your environment variables for Google AI Studio (GOOGLE_API_KEY, GOOGLE_GENAI_USE_VERTEXAI=FALSE) "
-        "or Vertex AI (GOOGLE_CLOUD_PROJECT, GOOGLE_CLOUD_LOCATION, GOOGLE_GENAI_USE_VERTEXAI=TRUE) are correctly set. "
-        "If using Vertex AI, ensure you have authenticated with `gcloud auth application-default login`."
-    )
-    root_agent = None # Set to None if initialization fails
+
+def _build_tools() -> list[FunctionTool]:
+    """Wraps every tool in a FunctionTool; only called when the agent is first built."""
+    return [make_function_tool(func) for func in _tool_functions()]
+
+# --- Configure and Define the Global LLM Agent (on first use) ---
+@functools.cache
+def get_agent() -> LlmAgent | None:
+    """Builds the planner agent and its tools on first call; returns None if initialization fails."""
+    settings = get_settings()
+    google_api_key = settings.google_api_key
+
+    llm_model_name = "gemini-2.5-flash-preview-05-20" # A good default
+
+    if settings.use_vertex_ai:
+        project_id = settings.google_cloud_project
+        location = settings.google_cloud_location
+        if not project_id or not location:
+            logger.error(
+                "GOOGLE_GENAI_USE_VERTEXAI is TRUE, but GOOGLE_CLOUD_PROJECT or GOOGLE_CLOUD_LOCATION "
+                "environment variables are not set. LLM agent will likely fail to initialize."
+            )
+            # Potentially raise an error or set agent to None to prevent partial initialization
+        else:
+            logger.info(f"Configuring LlmAgent for Vertex AI in {project_id}/{location} using model: {llm_model_name}.")
+    elif google_api_key:
+        logger.info(f"Configuring LlmAgent for Google AI Studio with API Key using model: {llm_model_name}.")
+    else:
+        logger.error(
+            "LLM configuration is incomplete. "
+            "For Google AI Studio: leave GOOGLE_GENAI_USE_VERTEXAI unset (or FALSE) and provide GOOGLE_API_KEY. "
+            "For Vertex AI: set GOOGLE_GENAI_USE_VERTEXAI=TRUE and provide GOOGLE_CLOUD_PROJECT & GOOGLE_CLOUD_LOCATION."
+        )
+        # Potentially raise an error or set agent to None
+
+    try:
+        root_agent = LlmAgent(
+            model=llm_model_name,
+            name="GlobalPlannerAgent", # Ensure this name is unique if running multiple agents
+            description="A helpful assistant that can use tools for math, files, SMS, and calls.",
+            instruction=load_planner_instruction(),
+            tools=_build_tools()
+        )
+        logger.info(f"GlobalPlannerAgent initialized with model '{llm_model_name}'.")
+        return root_agent
+    except Exception as e:
+        logger.error(f"Failed to initialize LlmAgent globally: {e}")
+        logger.error(
+            "Please ensure your environment variables for Google AI Studio (GOOGLE_API_KEY, GOOGLE_GENAI_USE_VERTEXAI=FALSE) "
+            "or Vertex AI (GOOGLE_CLOUD_PROJECT, GOOGLE_CLOUD_LOCATION, GOOGLE_GENAI_USE_VERTEXAI=TRUE) are correctly set. "
+            "If using Vertex AI, ensure you have authenticated with `gcloud auth application-default login`."
+        )
+        return None # root_agent is None if initialization fails
+
+def __getattr__(name: str):
+    # PEP 562: `from .adk_planner_agent import root_agent` keeps working, but the agent is only built on first access.
+    if name == "root_agent":
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
     # This block is typically not used when running with `adk run` or `adk web`,
     # as those tools import the `root_agent` directly.
     # However, you can add test code or a simple CLI interaction here if needed for direct script execution.
-    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
     logger.info("ADK Planner Agent Script - Loaded")
+    root_agent = get_agent()
     if root_agent is None:
         logger.error("root_agent could not be initialized. Exiting.")
     else:
@@ -133,7 +172,3 @@ if __name__ == "__main__":
             "Found AZURE_OPENAI_ENDPOINT. This ADK PlannerApp uses Google Gemini. "
             "Please ensure GOOGLE_API_KEY (for AI Studio) or GOOGLE_CLOUD_PROJECT/LOCATION (for Vertex AI) are set."
         )
-
-    if not os.getenv("TWILIO_ACCOUNT_SID") and os.getenv("TWILIO_SID"): # SK used TWILIO_SID
-         os.environ["TWILIO_ACCOUNT_SID"] = os.getenv("TWILIO_SID")
-         logger.info("Used TWILIO_SID as TWILIO_ACCOUNT_SID for ADK Twilio tools.")
@@ -1,7 +1,9 @@
+import asyncio
 import logging
 import os
-from twilio.rest import Client
-from dotenv import load_dotenv
+
+from ._twilio_client import format_twilio_error, get_twilio_client
+from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -9,10 +11,10 @@ class SmsTool:
     """Tool for sending SMS and MMS messages via Twilio."""
 
     def __init__(self):
-        load_dotenv() # Ensure environment variables are loaded
-        self._account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-        self._auth_token = os.getenv("TWILIO_AUTH_TOKEN")
-        self._from_phone = os.getenv("TWILIO_FROM_PHONE")
+        settings = get_settings()
+        self._account_sid = settings.twilio_account_sid
+        self._auth_token = settings.twilio_auth_token
+        self._from_phone = settings.twilio_from_phone
         self._client = None
 
         if not all([self._account_sid, self._auth_token, self._from_phone]):
@@ -20,12 +22,17 @@ class SmsTool:
                 "Twilio credentials (TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, TWILIO_FROM_PHONE) "
                 "not fully found in environment variables for SmsTool. Tool will not function."
             )
-        else:
+
+    @property
+    def client(self):
+        """Fetches the shared Twilio client on first use so the SDK is only imported when a message is sent."""
+        if self._client is None and all([self._account_sid, self._auth_token, self._from_phone]):
             try:
-                self._client = Client(self._account_sid, self._auth_token)
+                self._client = get_twilio_client(self._account_sid, self._auth_token)
                 logger.info("Twilio client for SmsTool initialized successfully.")
             except Exception as e:
                 logger.error(f"Failed to initialize Twilio client for SmsTool: {e}")
+        return self._client
 
     async def send_sms(
         self, 
@@ -33,14 +40,17 @@ class SmsTool:
         message: str
     ) -> str:
         """Send an SMS text message using the Twilio API."""
-        if not self._client:
+        client = self.client
+        if not client:
             error_msg = "SmsTool: Twilio client not initialized. Check credentials and logs."
             logger.error(error_msg)
             return error_msg
         
-        logger.info(f"SmsTool: Attempting to send SMS to {to_phone} with message: '{message[:30]}...'")
+        logger.info("SmsTool: Attempting to send SMS to %s with message: '%.30s...'", to_phone, message)
         try:
-            twilio_message = self._client.messages.create(
+            # The Twilio SDK is synchronous; run it in a worker thread so the event loop is not blocked.
+            twilio_message = await asyncio.to_thread(
+                client.messages.create,
                 to=to_phone,
                 from_=self._from_phone,
                 body=message
@@ -51,12 +61,12 @@ class SmsTool:
                 return success_msg
             else:
                 # This case might indicate an issue not caught by an exception
-                error_details = twilio_message.error_message if hasattr(twilio_message, 'error_message') and twilio_message.error_message else 'Unknown Twilio error'
+                error_details = getattr(twilio_message, 'error_message', None) or 'Unknown Twilio error'
                 error_msg = f"Failed to send SMS to {to_phone}. Twilio response: {error_details}"
                 logger.error(error_msg)
                 return error_msg
         except Exception as e:
-            error_msg = f"Error sending SMS to {to_phone}: {e}"
+            error_msg = format_twilio_error(f"sending SMS to {to_phone}", e)
             logger.error(error_msg)
             return error_msg
 
@@ -67,14 +77,17 @@ class SmsTool:
         media_url: str
     ) -> str:
         """Send an MMS message with media using the Twilio API."""
-        if not self._client:
+        client = self.client
+        if not client:
             error_msg = "SmsTool: Twilio client not initialized. Check credentials and logs."
             logger.error(error_msg)
             return error_msg
 
-        logger.info(f"SmsTool: Attempting to send MMS to {to_phone} with message: '{message[:30]}...' and media: {media_url}")
+        logger.info("SmsTool: Attempting to send MMS to %s with message: '%.30s...' and media: %s", to_phone, message, media_url)
         try:
-            twilio_message = self._client.messages.create(
+            # The Twilio SDK is synchronous; run it in a worker thread so the event loop is not blocked.
+            twilio_message = await asyncio.to_thread(
+                client.messages.create,
                 to=to_phone,
                 from_=self._from_phone,
                 body=message,
@@ -85,18 +98,17 @@ class SmsTool:
                 logger.info(success_msg)
                 return success_msg
             else:
-                error_details = twilio_message.error_message if hasattr(twilio_message, 'error_message') and twilio_message.error_message else 'Unknown Twilio error'
+                error_details = getattr(twilio_message, 'error_message', None) or 'Unknown Twilio error'
                 error_msg = f"Failed to send MMS to {to_phone}. Twilio response: {error_details}"
                 logger.error(error_msg)
                 return error_msg
         except Exception as e:
-            error_msg = f"Error sending MMS to {to_phone}: {e}"
+            error_msg = format_twilio_error(f"sending MMS to {to_phone}", e)
             logger.error(error_msg)
             return error_msg
 
 # Example usage (for testing the tool directly - requires Twilio credentials in .env):
 if __name__ == "__main__":
-    import asyncio
     logging.basicConfig(level=logging.INFO)
 
     test_to_phone = os.getenv("TEST_RECIPIENT_PHONE")
@@ -106,7 +118,7 @@ if __name__ == "__main__":
         print("Skipping SmsTool test: TEST_RECIPIENT_PHONE environment variable not set.")
     else:
         tool = SmsTool()
-        if tool._client: 
+        if tool.client:
             async def run_tests():
                 print("--- Testing SmsTool ---")
                 sms_result = await tool.send_sms(
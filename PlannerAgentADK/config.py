@@ -0,0 +1,34 @@
+import functools
+import os
+from dataclasses import dataclass
+
+from .env_loader import load_env_once
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment configuration for the planner agent and its tools."""
+    twilio_account_sid: str | None
+    twilio_auth_token: str | None
+    twilio_from_phone: str | None
+    google_api_key: str | None
+    use_vertex_ai: bool
+    google_cloud_project: str | None
+    google_cloud_location: str | None
+
+
+@functools.cache
+def get_settings() -> Settings:
+    """Returns the settings, reading the environment (and .env file) on the first call only."""
+    load_env_once()
+    return Settings(
+        # The Semantic Kernel app used TWILIO_SID, so accept it as a fallback.
+        twilio_account_sid=os.getenv("TWILIO_ACCOUNT_SID") or os.getenv("TWILIO_SID"),
+        twilio_auth_token=os.getenv("TWILIO_AUTH_TOKEN"),
+        twilio_from_phone=os.getenv("TWILIO_FROM_PHONE"),
+        google_api_key=os.getenv("GOOGLE_API_KEY"),
+        # GOOGLE_GENAI_USE_VERTEXAI defaults to off; any of 1/true/yes (case-insensitive) turns it on.
+        use_vertex_ai=os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "").strip().lower() in ("1", "true", "yes"),
+        google_cloud_project=os.getenv("GOOGLE_CLOUD_PROJECT"),
+        google_cloud_location=os.getenv("GOOGLE_CLOUD_LOCATION"),
+    )
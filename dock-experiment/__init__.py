@@ -1,2 +1,9 @@
 # This file makes 'dock-experiment' a Python package 
-from .dock_agent import agent 
\ No newline at end of file
+
+
+def __getattr__(name):
+    # The agent is built on first access to `agent` rather than when the package is imported.
+    if name == "agent":
+        from .dock_agent import get_agent
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,110 @@
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# With DOCKMIND_CONTEXT_CACHE=true, the system instruction and tool declarations are stored once as
+# Gemini cached content, and each model request references the cache instead of resending them.
+DOCKMIND_CONTEXT_CACHE = os.getenv("DOCKMIND_CONTEXT_CACHE", "false").strip().lower() == "true"
+CONTEXT_CACHE_TTL_SECONDS = 60 * 60
+# Handles are replaced this long before Gemini expires them, so a request never names an expired cache.
+_REFRESH_MARGIN_SECONDS = 60
+
+# Cache handles keyed on a hash of (model, instruction, tools): monotonic refresh time and cache name.
+# A name of None records a failed create, so the request falls back to inline content until the refresh time.
+# Expired handles are dropped, and at most _HANDLES_MAXSIZE are kept (the oldest refresh time goes first).
+_HANDLES_MAXSIZE = 64
+_handles: dict[str, tuple[float, str | None]] = {}
+# Keys whose cached content is being created; other requests with the same key send their content
+# inline meanwhile instead of waiting on (or duplicating) the create.
+_creating: set[str] = set()
+_lock = threading.Lock()
+
+
+@functools.cache
+def _get_client():
+    """Returns the Gemini client used to create cached content, configured from the environment like ADK's."""
+    from google import genai
+    return genai.Client()
+
+
+def _cache_key(model: str, config) -> str:
+    """Hashes the parts of a request that go into its cached content."""
+    payload = json.dumps(
+        [
+            model,
+            str(config.system_instruction),
+            [tool.model_dump(mode="json", exclude_none=True) for tool in config.tools or []],
+            config.tool_config.model_dump(mode="json", exclude_none=True) if config.tool_config else None,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _create_cached_content(key: str, model: str, config) -> str | None:
+    """Creates the cached content for key (a blocking network call) and records its handle."""
+    try:
+        from google.genai import types
+        cached_content = _get_client().caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                system_instruction=config.system_instruction,
+                tools=config.tools,
+                tool_config=config.tool_config,
+                ttl=f"{CONTEXT_CACHE_TTL_SECONDS}s",
+            ),
+        )
+        name = cached_content.name
+        logger.info("Created Gemini cached content %s for model %s.", name, model)
+    except Exception as e:
+        # E.g. the prefix is below the model's minimum cacheable size; requests keep sending it inline.
+        logger.warning("Could not create Gemini cached content; sending the instruction inline: %s", e)
+        name = None
+    now = time.monotonic()
+    with _lock:
+        _creating.discard(key)
+        for stale_key in [k for k, (refresh_at, _) in _handles.items() if now >= refresh_at]:
+            del _handles[stale_key]
+        _handles[key] = (now + CONTEXT_CACHE_TTL_SECONDS - _REFRESH_MARGIN_SECONDS, name)
+        while len(_handles) > _HANDLES_MAXSIZE:
+            del _handles[min(_handles, key=lambda k: _handles[k][0])]
+    return name
+
+
+async def _get_cached_content_name(model: str, config) -> str | None:
+    """Returns the cached content holding the config's instruction and tools, creating it when missing or stale.
+
+    The create runs in a worker thread without holding the lock, so no model request waits on another's create.
+    """
+    key = _cache_key(model, config)
+    with _lock:
+        entry = _handles.get(key)
+        if entry and time.monotonic() < entry[0]:
+            return entry[1]
+        if key in _creating:
+            return None # Another request is creating it; send this one inline
+        _creating.add(key)
+    return await asyncio.to_thread(_create_cached_content, key, model, config)
+
+
+async def use_cached_context(callback_context, llm_request):
+    """before_model_callback: swaps the request's instruction and tools for a reference to cached content."""
+    config = llm_request.config
+    if config is None or not config.system_instruction or config.cached_content:
+        return None
+    name = await _get_cached_content_name(llm_request.model, config)
+    if name:
+        # Gemini rejects requests that set these alongside cached_content; they are part of the cache.
+        config.cached_content = name
+        config.system_instruction = None
+        config.tools = None
+        config.tool_config = None
+    return None # Continue with the (now smaller) model request
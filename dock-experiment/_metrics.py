@@ -0,0 +1,79 @@
+import functools
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# With DOCKMIND_METRICS=true, Node API and tool latencies are recorded as Prometheus histograms and
+# served on DOCKMIND_METRICS_PORT (/metrics), so p50/p95/p99 per endpoint and per tool can be read off.
+# Metrics never fail a request or tool call: if they cannot be set up, recording is skipped and logged.
+DOCKMIND_METRICS = os.getenv("DOCKMIND_METRICS", "false").strip().lower() == "true"
+DOCKMIND_METRICS_PORT = int(os.getenv("DOCKMIND_METRICS_PORT", "9464"))
+
+# Session state key (per function call) holding a running tool's perf_counter start time. The temp:
+# prefix scopes it to the invocation, so a tool that raises (and never reaches record_tool_time)
+# leaves nothing behind.
+_TOOL_STARTED_AT_KEY = "temp:tool_started_at:"
+
+# The histograms are registered exactly once, at import; registering them again would raise
+# "Duplicated timeseries" from prometheus_client.
+_api_seconds = _tool_seconds = None
+if DOCKMIND_METRICS:
+    try:
+        import prometheus_client # Imported here so the dependency is only needed with DOCKMIND_METRICS=true
+        _api_seconds = prometheus_client.Histogram(
+            "dockmind_api_seconds", "Node API request latency", ["endpoint", "status"]
+        )
+        _tool_seconds = prometheus_client.Histogram(
+            "dockmind_tool_seconds", "DockMind tool execution time", ["tool"]
+        )
+    except Exception as e:
+        logger.error("DOCKMIND_METRICS is set, but the histograms could not be created; metrics are off: %s", e)
+
+
+@functools.cache
+def start_metrics_server() -> None:
+    """Serves /metrics on DOCKMIND_METRICS_PORT once per process; logs and carries on if that fails."""
+    if _api_seconds is None:
+        return
+    try:
+        prometheus_client.start_http_server(DOCKMIND_METRICS_PORT)
+        logger.info("Serving metrics on port %s.", DOCKMIND_METRICS_PORT)
+    except OSError as e:
+        # E.g. another worker already serves the port; observations are still recorded in this process.
+        logger.error("Could not serve metrics on port %s: %s", DOCKMIND_METRICS_PORT, e)
+
+
+def _observe(histogram, seconds: float, **labels) -> None:
+    """Records one observation; a metrics failure is logged, never raised into the caller."""
+    if histogram is None:
+        return
+    try:
+        histogram.labels(**labels).observe(seconds)
+    except Exception as e:
+        logger.warning("Could not record metric %s: %s", labels, e)
+
+
+def observe_api_call(endpoint_name: str, status: int | str, seconds: float) -> None:
+    """Records one Node API request; a no-op unless DOCKMIND_METRICS is set."""
+    _observe(_api_seconds, seconds, endpoint=endpoint_name, status=str(status))
+
+
+def observe_tool_call(tool_name: str, seconds: float) -> None:
+    """Records one tool call made outside ADK's tool callbacks (e.g. inside batch); a no-op unless DOCKMIND_METRICS is set."""
+    _observe(_tool_seconds, seconds, tool=tool_name)
+
+
+def start_tool_timer(tool, args, tool_context):
+    """before_tool_callback: notes when the tool call started."""
+    tool_context.state[_TOOL_STARTED_AT_KEY + tool_context.function_call_id] = time.perf_counter()
+    return None # Run the tool as usual
+
+
+def record_tool_time(tool, args, tool_context, tool_response):
+    """after_tool_callback: records how long the tool call took."""
+    started_at = tool_context.state.get(_TOOL_STARTED_AT_KEY + tool_context.function_call_id)
+    if started_at is not None:
+        observe_tool_call(tool.name, time.perf_counter() - started_at)
+    return None # Keep the tool's response unchanged
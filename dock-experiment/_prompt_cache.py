@@ -0,0 +1,109 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# With DOCKMIND_PROMPT_CACHE=true, a model call whose request exactly matches a recent one (same model,
+# instruction, tools and conversation so far) is answered from memory instead of calling Gemini again.
+DOCKMIND_PROMPT_CACHE = os.getenv("DOCKMIND_PROMPT_CACHE", "false").strip().lower() == "true"
+PROMPT_CACHE_TTL_SECONDS = 60 * 60
+PROMPT_CACHE_MAXSIZE = 512
+
+# These tools change server state or answer for the logged-in user, so a conversation that calls
+# them is never served from, or stored in, the cache.
+UNCACHEABLE_TOOL_NAMES = frozenset({
+    "login_user",
+    "create_trucking_shipment",
+    "get_current_user_profile",
+    "search_user_shipments",
+    "list_all_user_shipments",
+    "search_user_bookings_advanced",
+})
+
+_CACHE_KEY_STATE = "temp:prompt_cache_key" # temp: state lives for one invocation only
+
+_cache: OrderedDict[str, tuple[float, object]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _batched_tool_names(function_call) -> list:
+    """Returns the tool names inside a batch call's invocations (empty for any other call)."""
+    if function_call.name != "batch":
+        return []
+    invocations = (function_call.args or {}).get("invocations")
+    if not isinstance(invocations, list):
+        return []
+    return [invocation.get("tool_name") for invocation in invocations if isinstance(invocation, dict)]
+
+
+def _calls_uncacheable_tool(contents) -> bool:
+    """Returns True if any of the contents holds a function call to one of UNCACHEABLE_TOOL_NAMES,
+    directly or as one of a batch call's invocations."""
+    for content in contents:
+        for part in getattr(content, "parts", None) or []:
+            function_call = getattr(part, "function_call", None)
+            if function_call and (
+                function_call.name in UNCACHEABLE_TOOL_NAMES
+                or UNCACHEABLE_TOOL_NAMES.intersection(_batched_tool_names(function_call))
+            ):
+                return True
+    return False
+
+
+def _request_key(llm_request) -> str | None:
+    """Hashes everything the model sees for this request; returns None if the request must not be cached."""
+    if _calls_uncacheable_tool(llm_request.contents):
+        return None
+    system_instruction = llm_request.config.system_instruction if llm_request.config else None
+    payload = json.dumps(
+        [
+            llm_request.model,
+            str(system_instruction),
+            sorted(llm_request.tools_dict),
+            [content.model_dump(mode="json", exclude_none=True) for content in llm_request.contents],
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def lookup_cached_response(callback_context, llm_request):
+    """before_model_callback: returns a cached response for an identical request, skipping the model call."""
+    key = _request_key(llm_request)
+    callback_context.state[_CACHE_KEY_STATE] = key
+    if key is None:
+        return None
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        if now - entry[0] >= PROMPT_CACHE_TTL_SECONDS:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        response = entry[1]
+    logger.info(f"Prompt cache hit: {key}")
+    # ADK may annotate the response it receives, so each hit gets its own copy.
+    return response.model_copy(deep=True)
+
+
+def store_response(callback_context, llm_response):
+    """after_model_callback: remembers complete, successful responses for the request that produced them."""
+    key = callback_context.state.get(_CACHE_KEY_STATE)
+    if key is None or llm_response.partial or llm_response.error_code or not llm_response.content:
+        return None
+    if _calls_uncacheable_tool([llm_response.content]):
+        return None
+    with _lock:
+        _cache[key] = (time.monotonic(), llm_response.model_copy(deep=True))
+        _cache.move_to_end(key)
+        while len(_cache) > PROMPT_CACHE_MAXSIZE:
+            _cache.popitem(last=False)
+    return None # Keep the model's response unchanged
@@ -1,11 +1,23 @@
+import asyncio
+from collections import OrderedDict
+import functools
+from importlib import resources
 import logging
 from google.adk.agents import LlmAgent
-from google.adk.tools import FunctionTool
+from google.adk.tools import FunctionTool, ToolContext
 import os
-from dotenv import load_dotenv
+import re
+import time
+import uuid
+
+from .env_loader import load_env_once
+from ._context_cache import DOCKMIND_CONTEXT_CACHE, use_cached_context
+from ._metrics import DOCKMIND_METRICS, observe_tool_call, record_tool_time, start_metrics_server, start_tool_timer
+from ._prompt_cache import DOCKMIND_PROMPT_CACHE, UNCACHEABLE_TOOL_NAMES, lookup_cached_response, store_response
+from .tool_schema_cache import make_function_tool
 
 # Load environment variables from .env file if it exists
-load_dotenv()
+load_env_once()
 
 # Import your tools
 from .tools import vehicle_tools
@@ -13,135 +25,305 @@ from .tools import quoting_tools
 from .tools import user_tools
 from .tools import shipment_tools
 from .tools import location_tools
+from .services import node_api_service
 
-# Configure logging
+# Logging is configured by the application (adk web/run or the __main__ block below), not on import.
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-logger.info("DockMind Agent loading...")
-
-# --- Initialize Tools (Globally) ---
-# The ADK will use the function's docstring as its description to the LLM
-logger.info("Initializing tools...")
-get_vehicle_specs_tool = FunctionTool(func=vehicle_tools.get_vehicle_specs_by_vin)
-get_vehicle_makes_tool = FunctionTool(func=vehicle_tools.get_vehicle_makes_for_year)
-get_vehicle_models_tool = FunctionTool(func=vehicle_tools.get_vehicle_models_for_make_year)
-get_vehicle_years_tool = FunctionTool(func=vehicle_tools.get_vehicle_years_for_make_model)
-
-get_price_quote_tool = FunctionTool(func=quoting_tools.get_trucking_price_quote)
-get_quote_details_tool = FunctionTool(func=quoting_tools.get_quote_details_by_id)
-get_location_from_zip_tool = FunctionTool(func=location_tools.get_location_from_zip)
-
-# New User and Shipment Tools
-login_tool = FunctionTool(func=user_tools.login_user)
-get_profile_tool = FunctionTool(func=user_tools.get_current_user_profile)
-search_shipments_tool = FunctionTool(func=shipment_tools.search_user_shipments)
-search_bookings_advanced_tool = FunctionTool(func=shipment_tools.search_user_bookings_advanced)
-create_trucking_shipment_tool = FunctionTool(func=shipment_tools.create_trucking_shipment)
-
-all_tools = [
-    get_vehicle_specs_tool,
-    get_vehicle_makes_tool,
-    get_vehicle_models_tool,
-    get_vehicle_years_tool,
-    get_price_quote_tool,
-    get_quote_details_tool,
-    get_location_from_zip_tool,
-    login_tool,
-    get_profile_tool,
-    search_shipments_tool,
-    search_bookings_advanced_tool,
-    create_trucking_shipment_tool
-]
-logger.info(f"{len(all_tools)} tools initialized.")
+logger.addHandler(logging.NullHandler())
 
-# --- Define Agent Instruction --- 
-agent_instruction = (
-    "You are DockMind, a specialized AI assistant for vehicle information and shipping logistics. "
-    "You have two main roles: an anonymous Quoting Assistant and a personalized Booking and Tracking Assistant.\n\n"
-    
-    "--- CORE CAPABILITIES ---\n"
-    "1.  **Vehicle Information:** Look up vehicle specs by VIN, and find makes, models, and years.\n"
-    "2.  **Price Quotes:** Provide trucking price quotes based on origin, destination, and vehicle details.\n"
-    "3.  **User Accounts:** Allow users to log in to access personalized services.\n"
-    "4.  **Shipment Tracking:** Search a logged-in user's shipment history and check their status.\n"
-    "5.  **Create Trucking Shipment:** Guide a logged-in user through the process of creating and booking a new shipment. Triggered by phrases like 'post this vehicle' or 'make a booking'.\n\n"
-
-    "--- INTERACTION FLOW ---\n"
-    "**General Rules:**\n"
-    "- **Optional Parameters:** Many tools have optional parameters. You should NOT ask the user for values for these parameters. Only ask for information that is explicitly required for the tool to function. For example, in `create_trucking_shipment`, fields like `origin_address1` or `pickup_instructions` are optional; do not ask for them. Proceed with the tool call once you have the necessary required information.\n"
-    "- **Location Handling:** Users will often provide ambiguous locations (e.g., 'Manheim central Florida', 'Jacksonville port'). You MUST follow this process to resolve them:\n"
-    "    1. **Internal Deduction:** First, use your internal knowledge to determine a specific city, state, and ZIP code. For example, your internal knowledge should tell you that 'Manheim central Florida' is likely in Orlando, FL, and a search for 'Manheim Orlando, FL' would yield a ZIP code like 32818. 'Jacksonville port' is likely Jacksonville, FL, ZIP 32226.\n"
-    "    2.  **Tool Verification:** If your deduction gives you a ZIP code, you MUST verify it using the `get_location_from_zip` tool.\n"
-    "    3. **Last Resort - Ask:** Only if you are completely unable to deduce a specific location should you ask the user for clarification. Do not ask for clarification if you have a reasonable guess.\n\n"
-
-    "**Anonymous/Public Users (Not Logged In):**\n"
-    "- You can provide vehicle information (`get_vehicle_*` tools).\n"
-    "- **Quoting:** You can generate a price quote. Before calling `get_trucking_price_quote`, you MUST ensure you have `pickup_city`, `pickup_state`, `pickup_zip`, `delivery_city`, `delivery_state`, `delivery_zip`, `vehicle_year`, `vehicle_make`, and `vehicle_model`. For US-based queries, you MUST add `pickup_country='USA'` and `delivery_country='USA'` to the tool call yourself. After providing a quote, ask the user if they want to book the shipment.\n"
-    "- If a user asks to book a shipment or view their history, you MUST instruct them to log in first. Use the `login_user` tool.\n\n"
-
-    "**Logged-In Users:**\n"
-    "- **Personalization:** Greet them by name if possible. You can fetch their profile with `get_current_user_profile`.\n"
-    "- **Shipment History:** Use `search_user_shipments` for simple searches or `search_user_bookings_advanced` for more detailed queries (e.g., by status).\n"
-    "- **Create Trucking Shipment Workflow (A two-step process):**\n"
-    "    **Step 1: Quoting (if not already done)**\n"
-    "    - If the user asks to book a shipment but hasn't received a quote, first get them a quote by following the **Quoting** process above.\n\n"
-    "    **Step 2: Booking**\n"
-    "    - After providing a quote, if the user confirms they want to book, you MUST gather the remaining information. You cannot proceed until you have everything on this checklist:\n"
-    "        - `available_date` (in YYYY-MM-DD format)\n"
-    "        - `trailer_type` (e.g., 'Open' or 'Enclosed')\n"
-    "        - `offer_price` (float)\n"
-    "        - `total_price` (float)\n"
-    "        - `cod_amount` (float)\n"
-    "        - `vehicle_type` (e.g., 'car', 'suv', 'pickup')\n"
-    "    - If the user is interrupted (e.g., by logging in), you must re-confirm you have all items on this checklist before trying to call the tool.\n"
-    "    - **Tool Call:** Once all information from the quote AND the checklist above is gathered, call `create_trucking_shipment`.\n"
-    "    - **IMPORTANT:** If the tool call is successful, respond with a confirmation message like: 'Your booking request has been successfully submitted. Your order ID is [orderId_from_response].'\n\n"
-
-    "Always be polite and clear. If you need information, ask for it. If a tool fails, clearly state the error to the user."
+logger.debug("DockMind Agent loading...")
+
+# --- Tools ---
+# The ADK will use the function's docstring as its description to the LLM.
+# FunctionTool wrappers (and their schemas) are only built when the agent is first requested; see get_agent().
+TOOL_FUNCTIONS = (
+    vehicle_tools.get_vehicle_specs_by_vin,
+    vehicle_tools.get_vehicle_makes_for_year,
+    vehicle_tools.get_vehicle_models_for_make_year,
+    vehicle_tools.get_vehicle_years_for_make_model,
+    vehicle_tools.get_vehicle_catalog_bundle,
+    quoting_tools.get_trucking_price_quote,
+    quoting_tools.get_quote_details_by_id,
+    location_tools.get_location_from_zip,
+    location_tools.get_locations_from_zips,
+    # User and Shipment Tools
+    user_tools.login_user,
+    user_tools.get_current_user_profile,
+    shipment_tools.search_user_shipments,
+    shipment_tools.list_all_user_shipments,
+    shipment_tools.search_user_bookings_advanced,
+    shipment_tools.create_trucking_shipment,
+)
+
+def _run_in_thread(func):
+    """Exposes a blocking tool as a coroutine function with the same name, docstring and signature."""
+    # ADK awaits async tools and runs the function calls of one model response concurrently, so
+    # independent API lookups overlap instead of blocking the event loop one after another.
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return wrapper
+
+@functools.cache
+def _get_function_tool(name: str) -> FunctionTool:
+    """Returns the FunctionTool for a tool function, building it on first use."""
+    return make_function_tool(_run_in_thread(_TOOL_DISPATCH[name]))
+
+# --- Batch Meta-Tool ---
+# Lets the model request several independent lookups in one step; they run concurrently instead of
+# taking one LLM round-trip each. Only read-only lookups can be batched: the calls inside a batch are
+# not seen by the prompt cache's uncacheable-tool check or by the per-tool callbacks, so tools that log
+# in, create orders or answer for the logged-in user (UNCACHEABLE_TOOL_NAMES) must be called directly.
+_TOOL_DISPATCH = {func.__name__: func for func in TOOL_FUNCTIONS}
+BATCHABLE_TOOL_NAMES = (
+    "get_vehicle_specs_by_vin",
+    "get_vehicle_makes_for_year",
+    "get_vehicle_models_for_make_year",
+    "get_vehicle_years_for_make_model",
+    "get_vehicle_catalog_bundle",
+    "get_quote_details_by_id",
+    "get_location_from_zip",
+    "get_locations_from_zips",
+)
+assert not UNCACHEABLE_TOOL_NAMES.intersection(BATCHABLE_TOOL_NAMES)
+
+async def batch(invocations: list[dict], tool_context: ToolContext) -> list[dict]:
+    offered = _offered_tool_names(tool_context.state)
+
+    async def run(invocation: dict) -> dict:
+        tool_name = invocation.get("tool_name")
+        if tool_name not in BATCHABLE_TOOL_NAMES or tool_name not in offered:
+            return {"tool_name": tool_name, "result": {"error": True, "message": f"Tool cannot be batched: {tool_name}"}}
+        func = _TOOL_DISPATCH[tool_name]
+        started_at = time.perf_counter()
+        try:
+            # The tools make blocking HTTP calls, so each one runs in a worker thread.
+            result = await asyncio.to_thread(func, **(invocation.get("arguments") or {}))
+        except Exception as e:
+            logger.error(f"batch: {tool_name} failed: {e}")
+            result = {"error": True, "message": f"{tool_name} failed: {e}"}
+        observe_tool_call(tool_name, time.perf_counter() - started_at)
+        return {"tool_name": tool_name, "result": result}
+
+    logger.info(f"batch called with {len(invocations)} invocations.")
+    return list(await asyncio.gather(*(run(invocation) for invocation in invocations)))
+
+# The docstring is the tool description the LLM sees, so it lists the tools that can be batched.
+batch.__doc__ = (
+    "Runs several independent tool calls at the same time and returns their results in order.\n"
+    'Each invocation is an object like {"tool_name": "get_vehicle_specs_by_vin", "arguments": {"vin": "..."}}.\n'
+    "Only batch calls that do not depend on each other's results. "
+    f"Tools that can be batched: {', '.join(BATCHABLE_TOOL_NAMES)}."
 )
 
-# --- Define the LLM Agent (Globally) ---
-logger.info("Initializing LlmAgent...")
-# Configure the model name via an environment variable or a .env file
-# Default to gemini-2.5-flash-preview-05-20 if ADK_MODEL_NAME is not set
-llm_model_name = os.getenv("ADK_MODEL_NAME", "gemini-2.5-flash-preview-05-20")
-if llm_model_name == "gemini-2.5-flash-preview-05-20" and not os.getenv("ADK_MODEL_NAME"):
-    logger.info("Using default LLM model: gemini-2.5-flash-preview-05-20 (ADK_MODEL_NAME not set).")
-else:
-    logger.info(f"Using LLM model: {llm_model_name} (from ADK_MODEL_NAME environment variable).")
-
-try:
-    agent = LlmAgent(
-        model=llm_model_name,
-        name="DockMindAgent",
-        description="An agent to assist with vehicle information and shipping quotes.",
-        instruction=agent_instruction,
-        tools=all_tools,
-        # verbose=True # Optional: for more detailed ADK logging, enable if needed
-    )
-    logger.info(f"DockMind Agent '{agent.name}' initialized successfully with model '{llm_model_name}'.")
-    logger.info("Available tools:")
-    for i, tool in enumerate(agent.tools):
-        logger.info(f"  Tool {i+1}: {tool.name} - {tool.description}")
-    logger.info("Agent ready for ADK web/run.")
-except Exception as e:
-    logger.error(f"Failed to initialize LlmAgent: {e}", exc_info=True)
-    logger.error(
-        "Please ensure your GOOGLE_API_KEY is correctly set in your environment or .env file. "
-        "If you intended to use a specific model via ADK_MODEL_NAME, ensure it's a valid model identifier."
-    )
-    agent = None # Set agent to None if initialization fails
+# --- Lazy Tool Registration (opt-in) ---
+# With DOCKMIND_LAZY=true each session starts with a small core tool set and loads the rest on demand
+# through the discover_tools meta-tool, so turns that never need them skip their schemas in the prompt.
+# The agent holds every tool; the names a session has loaded live in its state, and
+# _offer_session_tools drops the others from each model request, so one session's loads never
+# reach another.
+DOCKMIND_LAZY = os.getenv("DOCKMIND_LAZY", "false").strip().lower() == "true"
+CORE_TOOL_NAMES = ("get_trucking_price_quote", "get_vehicle_specs_by_vin", "login_user")
+DEFERRED_TOOL_NAMES = [name for name in _TOOL_DISPATCH if name not in CORE_TOOL_NAMES]
+_META_TOOL_NAMES = ("discover_tools", "batch")
+_LOADED_TOOLS_KEY = "loaded_tool_names"
+
+def _offered_tool_names(state) -> set[str]:
+    """Returns the tools offered to the session: all of them, or in lazy mode the core and loaded ones."""
+    if not DOCKMIND_LAZY:
+        return set(_TOOL_DISPATCH)
+    return {*CORE_TOOL_NAMES, *(state.get(_LOADED_TOOLS_KEY) or [])}
+
+def _register_deferred_tools(state, names: list[str]) -> tuple[list[str], list[str]]:
+    """Adds the named deferred tools to the session's loaded set; returns (newly loaded, unknown) names."""
+    registered = list(state.get(_LOADED_TOOLS_KEY) or [])
+    loaded, unknown = [], []
+    for name in names:
+        if name not in DEFERRED_TOOL_NAMES:
+            unknown.append(name)
+        elif name not in registered:
+            registered.append(name)
+            loaded.append(name)
+    if loaded:
+        # Assigned rather than mutated so the session service records the change.
+        state[_LOADED_TOOLS_KEY] = registered
+    return loaded, unknown
+
+def discover_tools(names: list[str], tool_context: ToolContext) -> dict:
+    if get_agent() is None:
+        return {"error": True, "message": "Agent is not initialized."}
+    loaded, unknown = _register_deferred_tools(tool_context.state, names)
+    logger.info(f"discover_tools loaded: {loaded}, unknown: {unknown}")
+    return {"loaded": loaded, "unknown": unknown}
+
+# The docstring is the tool description the LLM sees, so it lists the tools that can be loaded.
+discover_tools.__doc__ = (
+    "Loads additional tools so they can be called on the next step. "
+    f"Pass the names of the tools you need. Available tools: {', '.join(DEFERRED_TOOL_NAMES)}."
+)
+
+# Cheap intent detection for the lazy mode: when a request clearly matches a known intent, its tools
+# are loaded before the model runs, saving the discover_tools round-trip on simple requests.
+_VIN_PATTERN = re.compile(r"\b[A-HJ-NPR-Z0-9]{17}\b", re.IGNORECASE)
+_INTENT_KEYWORDS = {
+    "quote": ("quote", "price", "cost"),
+    "booking": ("book", "post this vehicle", "ship my", "create a shipment"),
+    "tracking": ("track", "shipment", "history", "status"),
+    "account": ("login", "log in", "log me in", "who am i", "profile"),
+}
+_INTENT_TOOLS = {
+    "vin": ["get_vehicle_specs_by_vin"],
+    "quote": ["get_locations_from_zips", "get_quote_details_by_id"],
+    "booking": ["get_locations_from_zips", "get_current_user_profile", "create_trucking_shipment"],
+    "tracking": ["search_user_shipments", "list_all_user_shipments", "search_user_bookings_advanced"],
+    "account": ["get_current_user_profile"],
+}
+
+def classify_task_complexity(prompt: str) -> tuple[str, list[str]]:
+    """Classifies a user request as ("SIMPLE", predicted tool names) or ("COMPLEX", [])."""
+    text = prompt.lower()
+    intents = [intent for intent, keywords in _INTENT_KEYWORDS.items() if any(k in text for k in keywords)]
+    if _VIN_PATTERN.search(prompt):
+        intents.append("vin")
+    if not intents:
+        return "COMPLEX", []
+    tool_names = list(dict.fromkeys(name for intent in intents for name in _INTENT_TOOLS[intent]))
+    return "SIMPLE", tool_names
+
+def _preload_tools_for_intent(callback_context):
+    """before_agent_callback: loads the predicted tools for SIMPLE requests before the model runs."""
+    content = callback_context.user_content
+    if get_agent() is None or not content or not content.parts:
+        return None
+    prompt = " ".join(part.text for part in content.parts if part.text)
+    complexity, tool_names = classify_task_complexity(prompt)
+    if complexity == "SIMPLE":
+        loaded, _ = _register_deferred_tools(callback_context.state, tool_names)
+        if loaded:
+            logger.info(f"Preloaded tools for a SIMPLE request: {loaded}")
+    return None # Continue with the normal agent run
+
+def _offer_session_tools(callback_context, llm_request):
+    """before_model_callback: limits the request's tools to the core set plus the session's loaded tools."""
+    offered = {*_offered_tool_names(callback_context.state), *_META_TOOL_NAMES}
+    for tool in llm_request.config.tools or []:
+        if tool.function_declarations:
+            tool.function_declarations = [decl for decl in tool.function_declarations if decl.name in offered]
+    # A call to a tool that was not offered is then rejected as unknown instead of being run.
+    llm_request.tools_dict = {name: tool for name, tool in llm_request.tools_dict.items() if name in offered}
+    return None # Continue with the (filtered) model request
+
+# --- Per-Session Login State ---
+# The session remembers a random key; the auth state stored under that key is bound to the invocation's
+# context before the agent runs, so each chat session stays logged in as its own user. Only the most
+# recently active _AUTH_SESSIONS_MAXSIZE sessions are kept; an older session has to log in again.
+_AUTH_SESSION_KEY = "auth_session_key"
+_AUTH_SESSIONS_MAXSIZE = 1024
+_auth_sessions: OrderedDict[str, dict] = OrderedDict()
+
+def _bind_auth_session(callback_context):
+    """before_agent_callback: binds this session's login state for the tools called in this invocation."""
+    key = callback_context.state.get(_AUTH_SESSION_KEY)
+    if key is None:
+        key = uuid.uuid4().hex
+        callback_context.state[_AUTH_SESSION_KEY] = key
+    auth_session = _auth_sessions.pop(key, None) or node_api_service.new_auth_session()
+    _auth_sessions[key] = auth_session # Re-inserted so the entry counts as the most recently used
+    while len(_auth_sessions) > _AUTH_SESSIONS_MAXSIZE:
+        _auth_sessions.popitem(last=False)
+    node_api_service.bind_auth_session(auth_session)
+    return None # Continue with the normal agent run
+
+# --- Define Agent Instruction --- 
+# The instruction text lives in dockmind_instruction.txt so it can be edited without touching code.
+@functools.cache
+def load_agent_instruction() -> str:
+    """Reads the DockMind instruction from dockmind_instruction.txt on first call."""
+    agent_instruction = resources.files(__package__).joinpath("dockmind_instruction.txt").read_text(encoding="utf-8").rstrip("\n")
+    if DOCKMIND_LAZY:
+        agent_instruction += (
+            "\n\nOnly some tools are loaded at the start. If you need a tool that is not available yet, "
+            "call `discover_tools` with its name first, then call it."
+        )
+    return agent_instruction
+
+# --- Define the LLM Agent (on first use) ---
+@functools.cache
+def get_agent() -> LlmAgent | None:
+    """Builds the DockMind agent and its tools on first call; returns None if initialization fails."""
+    logger.debug("Initializing tools...")
+    agent_tools = [_get_function_tool(name) for name in _TOOL_DISPATCH] + [make_function_tool(batch)]
+    if DOCKMIND_LAZY:
+        agent_tools.append(make_function_tool(discover_tools))
+        logger.info(f"DOCKMIND_LAZY is set: sessions start with {len(CORE_TOOL_NAMES)} core tools; {len(DEFERRED_TOOL_NAMES)} tools load on demand.")
+    logger.info(f"{len(agent_tools)} tools initialized.")
+
+    logger.debug("Initializing LlmAgent...")
+    # Configure the model name via an environment variable or a .env file
+    # Default to gemini-2.5-flash-preview-05-20 if ADK_MODEL_NAME is not set
+    llm_model_name = os.getenv("ADK_MODEL_NAME", "gemini-2.5-flash-preview-05-20")
+    if llm_model_name == "gemini-2.5-flash-preview-05-20" and not os.getenv("ADK_MODEL_NAME"):
+        logger.info("Using default LLM model: gemini-2.5-flash-preview-05-20 (ADK_MODEL_NAME not set).")
+    else:
+        logger.info(f"Using LLM model: {llm_model_name} (from ADK_MODEL_NAME environment variable).")
+
+    # The prompt cache keys on the full instruction, so it must run before the context cache replaces it.
+    # Both see the request's tools, so the session's tool filter runs first.
+    before_model_callbacks = [_offer_session_tools] if DOCKMIND_LAZY else []
+    if DOCKMIND_PROMPT_CACHE:
+        before_model_callbacks.append(lookup_cached_response)
+    if DOCKMIND_CONTEXT_CACHE and DOCKMIND_LAZY:
+        # Every distinct set of loaded tools would need its own (billed) cached content.
+        logger.warning("DOCKMIND_CONTEXT_CACHE is ignored with DOCKMIND_LAZY: the tool set differs per session.")
+    elif DOCKMIND_CONTEXT_CACHE:
+        before_model_callbacks.append(use_cached_context)
+
+    try:
+        agent = LlmAgent(
+            model=llm_model_name,
+            name="DockMindAgent",
+            description="An agent to assist with vehicle information and shipping quotes.",
+            instruction=load_agent_instruction(),
+            tools=agent_tools,
+            before_agent_callback=[_bind_auth_session, _preload_tools_for_intent] if DOCKMIND_LAZY else _bind_auth_session,
+            before_model_callback=before_model_callbacks or None,
+            after_model_callback=store_response if DOCKMIND_PROMPT_CACHE else None,
+            before_tool_callback=start_tool_timer if DOCKMIND_METRICS else None,
+            after_tool_callback=record_tool_time if DOCKMIND_METRICS else None,
+            # verbose=True # Optional: for more detailed ADK logging, enable if needed
+        )
+        logger.info(f"DockMind Agent '{agent.name}' initialized successfully with model '{llm_model_name}'.")
+        logger.info("Available tools: %s", [tool.name for tool in agent.tools])
+        node_api_service.warm_up_connection()
+        if DOCKMIND_METRICS:
+            start_metrics_server()
+        logger.info("Agent ready for ADK web/run.")
+        return agent
+    except Exception as e:
+        logger.error(f"Failed to initialize LlmAgent: {e}", exc_info=True)
+        logger.error(
+            "Please ensure your GOOGLE_API_KEY is correctly set in your environment or .env file. "
+            "If you intended to use a specific model via ADK_MODEL_NAME, ensure it's a valid model identifier."
+        )
+        return None # Agent is None if initialization fails
+
+def __getattr__(name: str):
+    # PEP 562: `from .dock_agent import agent` keeps working, but the agent is only built on first access.
+    if name == "agent":
+        return get_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     # This block is typically not used when running with `adk run` or `adk web`,
     # as those tools import the `agent` directly.
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     logger.info("DockMind Agent script loaded for direct execution (e.g., python dock_agent.py).")
+    agent = get_agent()
     if agent is None:
         logger.error("DockMind Agent (agent) could not be initialized. Cannot run directly. Please check logs for errors.")
     else:
         logger.info(f"Global agent '{agent.name}' is defined and ready.")
-        logger.info("To interact with this agent via a web interface, use 'adk web dock_agent' from the 'dock-experiment' directory.")
+        logger.info("To interact with this agent via a web interface, run 'adk web' from the repository root and pick 'dock-experiment'.")
         logger.info("Ensure GOOGLE_API_KEY, API_BASE_URL, and optionally ADK_MODEL_NAME environment variables are set (e.g., in a .env file).")
         logger.info("Example queries you could try with adk web/run:")
         logger.info("- What are the specs for VIN 1HGCM82633A123456?")
@@ -0,0 +1,9 @@
+import functools
+
+from dotenv import load_dotenv
+
+
+@functools.cache
+def load_env_once() -> None:
+    """Loads variables from the .env file on the first call; later calls are no-ops."""
+    load_dotenv()
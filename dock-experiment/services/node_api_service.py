@@ -1,15 +1,43 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import contextvars
+import hashlib
 import os
 import logging
+import threading
 import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+
+from .._metrics import observe_api_call
 
 logger = logging.getLogger(__name__)
 
 # --- Authentication State ---
-# This is a simple in-memory store for the auth token.
-# In a real-world multi-user scenario, this would be handled by a more robust session management system.
-AUTH_TOKEN = None
-CURRENT_USER = None
+# Each agent session has its own auth state: {"token": ..., "user": ...}. The agent binds the session's
+# state to the running context with bind_auth_session(), so concurrent sessions never see each other's
+# token and need no locking. login() updates the bound dict in place, so the change is visible to
+# worker threads (which run in a copy of the context) and to later turns that bind the same dict.
+# Code that never binds a session, such as running this module directly, gets a fresh logged-out state
+# for its own context on first use; there is no shared default, so one caller's login never leaks to another.
+AUTH_SESSION: contextvars.ContextVar[dict | None] = contextvars.ContextVar("AUTH_SESSION", default=None)
+
+def new_auth_session() -> dict:
+    """Returns an empty (logged-out) auth state for a new agent session."""
+    return {"token": None, "user": None}
+
+def bind_auth_session(auth_session: dict) -> None:
+    """Makes auth_session the auth state for the current context (e.g. one agent invocation)."""
+    AUTH_SESSION.set(auth_session)
+
+def _current_auth_session() -> dict:
+    """Returns the auth state bound to the current context, binding a new logged-out one if there is none."""
+    auth_session = AUTH_SESSION.get()
+    if auth_session is None:
+        auth_session = new_auth_session()
+        AUTH_SESSION.set(auth_session)
+    return auth_session
 
 # Attempt to get API_BASE_URL from environment variable, otherwise use a default
 API_BASE_URL = os.getenv("API_BASE_URL")
@@ -23,31 +51,65 @@ COMMON_HEADERS = {
     "Accept": "application/json"
 }
 
+# One session for every API call, so repeated calls reuse pooled keep-alive connections instead of
+# paying a new TCP and TLS handshake each time. Retries only cover connection failures, gateway errors
+# and idempotent methods (urllib3's default), so POSTs such as quote and order creation are never resent.
+SESSION = requests.Session()
+SESSION.headers.update(COMMON_HEADERS)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # raise_on_status=False hands the last gateway error to _handle_response as before instead of raising.
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False),
+))
+
+def _warm_up():
+    try:
+        SESSION.get(f"{API_BASE_URL}/function/makes", params={"year": "2024"}, timeout=5)
+    except requests.exceptions.RequestException as e:
+        logger.debug("Connection warm-up failed: %s", e)
+
+def warm_up_connection() -> None:
+    """Opens a pooled connection to the API in the background, so the first tool call skips the TLS handshake."""
+    # A cheap catalog GET; the response is discarded, only the DNS lookup and keep-alive connection are kept.
+    threading.Thread(target=_warm_up, name="node-api-warm-up", daemon=True).start()
+
 def _get_auth_headers():
-    """Helper to get headers, including auth if available."""
-    headers = COMMON_HEADERS.copy()
-    if AUTH_TOKEN:
-        # Per the workaround, the token is sent directly without the "Bearer" prefix.
-        headers["Authorization"] = AUTH_TOKEN
-    return headers
+    """Helper to get the per-request headers; None means the session's COMMON_HEADERS are enough."""
+    token = _current_auth_session()["token"]
+    # Per the workaround, the token is sent directly without the "Bearer" prefix.
+    return {"Authorization": token} if token else None
+
+class _PayloadHead:
+    """Log argument that renders the first 200 bytes of a JSON payload, only if the record is emitted."""
+    __slots__ = ("payload",)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self):
+        return orjson.dumps(self.payload)[:200].decode(errors="replace")
 
 def _handle_response(response: requests.Response, endpoint_name: str):
     """Helper function to handle API responses."""
+    # elapsed runs from sending the request to parsing the response headers, i.e. the network round-trip.
+    observe_api_call(endpoint_name, response.status_code, response.elapsed.total_seconds())
     try:
         response.raise_for_status()  # Raises an HTTPError for bad responses (4XX or 5XX)
         # Check if response content is not empty before trying to parse JSON
         if response.content:
-            return response.json()
+            # orjson parses the raw bytes directly, skipping the decode-to-str step of response.json().
+            return orjson.loads(response.content)
         else:
             # Handle empty successful responses if applicable, or treat as an issue
-            logger.warning(f"Empty response from {endpoint_name} with status {response.status_code}")
+            logger.warning("Empty response from %s with status %s", endpoint_name, response.status_code)
             return {"error": True, "message": f"Empty response from API for {endpoint_name}.", "status_code": response.status_code}
             
     except requests.exceptions.HTTPError as http_err:
         logger.error(f"HTTP error occurred calling {endpoint_name}: {http_err} - Response: {response.text}")
         try:
             # Try to parse error response if it's JSON
-            error_details = response.json()
+            error_details = orjson.loads(response.content)
             # Try to extract a more specific message if available
             specific_message = error_details.get("message") or error_details.get("error")
             if not specific_message:
@@ -69,33 +131,62 @@ def _handle_response(response: requests.Response, endpoint_name: str):
         return {"error": True, "message": f"Invalid JSON response from API for {endpoint_name}.", "details": response.text}
 
 
+# Last ETag and raw body per cacheable request (endpoint plus sorted params). Refreshing the vehicle
+# catalog or a quote then costs a 304 with no body when the data has not changed, instead of a full
+# download. The body is kept as bytes and parsed again on every hit, so callers in different sessions
+# never share (and mutate) one dict. Quote IDs keep coming, so the oldest entries are dropped beyond
+# _ETAG_STORE_MAXSIZE.
+_ETAG_STORE_MAXSIZE = 1024
+_etag_store: dict[tuple, tuple[str, bytes]] = {}
+_etag_lock = threading.Lock()
+
+def _get_with_etag(endpoint: str, params: dict, endpoint_name: str, timeout: int = 10):
+    """GETs a cacheable endpoint, revalidating the last response with If-None-Match when there is one."""
+    key = (endpoint, tuple(sorted(params.items())))
+    cached = _etag_store.get(key)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    response = SESSION.get(endpoint, params=params, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cached:
+        logger.debug("%s not modified; reusing the cached response.", endpoint_name)
+        return orjson.loads(cached[1])
+    result = _handle_response(response, endpoint_name)
+    etag = response.headers.get("ETag")
+    if etag and response.content and not (isinstance(result, dict) and result.get("error")):
+        with _etag_lock:
+            _etag_store.pop(key, None) # Re-insert so the entry counts as the newest
+            _etag_store[key] = (etag, response.content)
+            while len(_etag_store) > _ETAG_STORE_MAXSIZE:
+                del _etag_store[next(iter(_etag_store))]
+    return result
+
+
 def login(email: str, password: str) -> dict:
     """Calls the Node.js API to log in a user and stores the auth token."""
-    global AUTH_TOKEN, CURRENT_USER
+    auth_session = _current_auth_session()
     endpoint = f"{API_BASE_URL}/auth/login"
     payload = {"email": email, "password": password}
-    logger.info(f"Calling API: POST {endpoint} for user login.")
+    logger.info("Calling API: POST %s for user login.", endpoint)
     try:
-        response = requests.post(endpoint, json=payload, headers=COMMON_HEADERS, timeout=15)
+        response = SESSION.post(endpoint, data=orjson.dumps(payload), timeout=15)
         result = _handle_response(response, "login")
 
         # Based on Node.js app, token is nested in a 'data' object.
         token = result.get("data", {}).get("_token")
         
         if not result.get("error") and token:
-            AUTH_TOKEN = token
-            logger.info(f"Login successful. Auth token stored for user.")
+            auth_session["token"] = token
+            logger.info("Login successful. Auth token stored for user.")
             
             # The user object is also expected in the 'data' field
             user_data = result.get("data", {}).get("user")
-            CURRENT_USER = user_data
+            auth_session["user"] = user_data
             return {"success": True, "message": "Login successful.", "user": user_data}
         elif not result.get("error"):
-            logger.warning(f"Login response did not contain a '_token' in the 'data' field. Response: {result}")
+            logger.warning("Login response did not contain a '_token' in the 'data' field. Response: %s", result)
             return {"error": True, "message": "Login successful, but no authentication token was received."}
         else:
-            AUTH_TOKEN = None # Clear any previous token on failed login
-            CURRENT_USER = None
+            auth_session["token"] = None # Clear any previous token on failed login
+            auth_session["user"] = None
             return result
     except requests.exceptions.Timeout:
         logger.error(f"Timeout calling {endpoint}")
@@ -103,21 +194,21 @@ def login(email: str, password: str) -> dict:
 
 def get_user_profile() -> dict:
     """Calls the Node.js API to get the current user's profile using the stored auth token."""
-    global CURRENT_USER
-    if not AUTH_TOKEN:
+    auth_session = _current_auth_session()
+    if not auth_session["token"]:
         return {"error": True, "message": "You must be logged in to perform this action."}
     
-    if CURRENT_USER:
+    if auth_session["user"]:
         logger.info("Returning user profile from cache.")
-        return {"success": True, "data": CURRENT_USER}
+        return {"success": True, "data": auth_session["user"]}
 
     endpoint = f"{API_BASE_URL}/users/me"
-    logger.info(f"Calling API: GET {endpoint} for user profile.")
+    logger.info("Calling API: GET %s for user profile.", endpoint)
     try:
-        response = requests.get(endpoint, headers=_get_auth_headers(), timeout=10)
+        response = SESSION.get(endpoint, headers=_get_auth_headers(), timeout=10)
         result = _handle_response(response, "get_user_profile")
         if not result.get("error"):
-            CURRENT_USER = result.get("data")
+            auth_session["user"] = result.get("data")
         return result
     except requests.exceptions.Timeout:
         logger.error(f"Timeout calling {endpoint}")
@@ -125,15 +216,27 @@ def get_user_profile() -> dict:
 
 def get_current_user_data() -> dict:
     """Returns the stored data for the currently logged-in user, if available."""
-    return CURRENT_USER
+    return _current_auth_session()["user"]
+
+def get_auth_cache_key() -> str | None:
+    """Returns a log-safe key identifying the current login (None when logged out), for per-user caches."""
+    token = _current_auth_session()["token"]
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=8).hexdigest() if token else None
+
+def get_user_cache_key() -> str | None:
+    """Returns a log-safe key identifying the logged-in user (None when unknown); unlike get_auth_cache_key,
+    it stays the same when the user logs in again."""
+    user = _current_auth_session()["user"]
+    email = user.get("email") if isinstance(user, dict) else None
+    return hashlib.blake2b(email.strip().lower().encode("utf-8"), digest_size=8).hexdigest() if email else None
 
 def fetch_vehicle_specs(vin: str) -> dict:
     """Calls the Node.js API to get vehicle specifications by VIN."""
     endpoint = f"{API_BASE_URL}/function/vehicle"
     params = {"vin": vin}
-    logger.info(f"Calling API: GET {endpoint} with VIN: {vin}")
+    logger.info("Calling API: GET %s with VIN: %s", endpoint, vin)
     try:
-        response = requests.get(endpoint, params=params, headers=COMMON_HEADERS, timeout=10)
+        response = SESSION.get(endpoint, params=params, timeout=10)
         return _handle_response(response, "fetch_vehicle_specs")
     except requests.exceptions.Timeout:
         logger.error(f"Timeout calling {endpoint}")
@@ -144,10 +247,9 @@ def fetch_vehicle_makes(year: str) -> dict:
     """Calls the Node.js API to get vehicle makes for a given year."""
     endpoint = f"{API_BASE_URL}/function/makes"
     params = {"year": year}
-    logger.info(f"Calling API: GET {endpoint} with year: {year}")
+    logger.info("Calling API: GET %s with year: %s", endpoint, year)
     try:
-        response = requests.get(endpoint, params=params, headers=COMMON_HEADERS, timeout=10)
-        return _handle_response(response, "fetch_vehicle_makes")
+        return _get_with_etag(endpoint, params, "fetch_vehicle_makes")
     except requests.exceptions.Timeout:
         logger.error(f"Timeout calling {endpoint}")
         return {"error": True, "message": "API request timed out for fetch_vehicle_makes."}
@@ -157,10 +259,9 @@ def fetch_vehicle_models(make: str, year: str) -> dict:
     """Calls the Node.js API to get vehicle models for a given make and year."""
     endpoint = f"{API_BASE_URL}/function/model"
     params = {"make": make, "year": year}
-    logger.info(f"Calling API: GET {endpoint} with make: {make}, year: {year}")
+    logger.info("Calling API: GET %s with make: %s, year: %s", endpoint, make, year)
     try:
-        response = requests.get(endpoint, params=params, headers=COMMON_HEADERS, timeout=10)
-        return _handle_response(response, "fetch_vehicle_models")
+        return _get_with_etag(endpoint, params, "fetch_vehicle_models")
     except requests.exceptions.Timeout:
         logger.error(f"Timeout calling {endpoint}")
         return {"error": True, "message": "API request timed out for fetch_vehicle_models."}
@@ -170,21 +271,20 @@ def fetch_vehicle_years(make: str, model: str) -> dict:
     """Calls the Node.js API to get vehicle years for a given make and model."""
     endpoint = f"{API_BASE_URL}/function/year"
     params = {"make": make, "model": model}
-    logger.info(f"Calling API: GET {endpoint} with make: {make}, model: {model}")
+    logger.info("Calling API: GET %s with make: %s, model: %s", endpoint, make, model)
     try:
-        response = requests.get(endpoint, params=params, headers=COMMON_HEADERS, timeout=10)
-        return _handle_response(response, "fetch_vehicle_years")
+        return _get_with_etag(endpoint, params, "fetch_vehicle_years")
     except requests.exceptions.Timeout:
         logger.error(f"Timeout calling {endpoint}")
         return {"error": True, "message": "API request timed out for fetch_vehicle_years."}
 
 
-def submit_for_quote(payload: dict) -> dict:
-    """Calls the Node.js API to submit details for a trucking price quote."""
+def submit_for_quote(payload) -> dict:
+    """Calls the Node.js API to submit details for a trucking price quote (a dict or a payload dataclass)."""
     endpoint = f"{API_BASE_URL}/trucking/check/prices"
-    logger.info(f"Calling API: POST {endpoint} with payload: {json.dumps(payload)[:200]}...") # Log truncated payload
+    logger.info("Calling API: POST %s with payload: %s...", endpoint, _PayloadHead(payload)) # Log truncated payload
     try:
-        response = requests.post(endpoint, json=payload, headers=_get_auth_headers(), timeout=20) # Longer timeout for potential processing
+        response = SESSION.post(endpoint, data=orjson.dumps(payload), headers=_get_auth_headers(), timeout=20) # Longer timeout for potential processing
         # The actual quote ID is in a top-level "quote" field, not necessarily in the "data" field for this specific API.
         # The _handle_response will give us the parsed JSON. We let the tool layer extract the quote ID.
         return _handle_response(response, "submit_for_quote")
@@ -199,33 +299,100 @@ def submit_for_quote(payload: dict) -> dict:
 def fetch_quote_details(quote_id: str) -> dict:
     """Calls the Node.js API to get details for a specific quote ID."""
     endpoint = f"{API_BASE_URL}/search/quote/{quote_id}" # Path parameter, not query
-    logger.info(f"Calling API: GET {endpoint}")
+    logger.info("Calling API: GET %s", endpoint)
     try:
-        response = requests.get(endpoint, headers=COMMON_HEADERS, timeout=10)
-        return _handle_response(response, "fetch_quote_details")
+        return _get_with_etag(endpoint, {}, "fetch_quote_details")
     except requests.exceptions.Timeout:
         logger.error(f"Timeout calling {endpoint}")
         return {"error": True, "message": "API request timed out for fetch_quote_details."}
 
+# The parts of a trucking order the agent needs to describe a shipment: the fields create_trucking_order
+# sends (see shipment_tools.create_trucking_shipment), kept whole so addresses, contact phones and the
+# price breakdown survive, plus the ids, status and creation time the API adds. Anything else on the
+# stored order documents (audit data and the like) would only cost input tokens on every later turn.
+_ORDER_SUMMARY_FIELDS = (
+    "_id", "id", "orderId", "status", "createdAt",
+    "origin", "destination", "trailerType", "vehicles", "availableDate", "hasInOpvehicle", "price",
+    "PickupInstructions",
+)
+_ORDER_LIST_KEYS = ("docs", "items", "orders", "results")
+
+def _summarize_order(order):
+    """Keeps only the summary fields of one order; anything not shaped like an order is returned unchanged."""
+    if not isinstance(order, dict):
+        return order
+    summary = {key: order[key] for key in _ORDER_SUMMARY_FIELDS if key in order}
+    return summary or order
+
+def _summarize_orders(result: dict) -> dict:
+    """Trims the orders in a search response (a list under "data", or under data.docs/items/...) in place."""
+    data = result.get("data")
+    if isinstance(data, list):
+        result["data"] = [_summarize_order(order) for order in data]
+    elif isinstance(data, dict):
+        for key in _ORDER_LIST_KEYS:
+            if isinstance(data.get(key), list):
+                data[key] = [_summarize_order(order) for order in data[key]]
+                break
+    return result
+
 def search_trucking_orders(search_query: str = None, limit: int = 10, page: int = 1) -> dict:
     """Calls the Node.js API to search a user's trucking orders."""
-    if not AUTH_TOKEN:
+    if not _current_auth_session()["token"]:
         return {"error": True, "message": "You must be logged in to perform this action."}
     endpoint = f"{API_BASE_URL}/trucking"
     params = {"limit": limit, "page": page}
     if search_query:
         params["search"] = search_query
-    logger.info(f"Calling API: GET {endpoint} with params: {params}")
+    logger.info("Calling API: GET %s with params: %s", endpoint, params)
     try:
-        response = requests.get(endpoint, params=params, headers=_get_auth_headers(), timeout=15)
-        return _handle_response(response, "search_trucking_orders")
+        response = SESSION.get(endpoint, params=params, headers=_get_auth_headers(), timeout=15)
+        result = _handle_response(response, "search_trucking_orders")
+        return result if result.get("error") else _summarize_orders(result)
     except requests.exceptions.Timeout:
         logger.error(f"Timeout calling {endpoint}")
         return {"error": True, "message": "API request timed out for search_trucking_orders."}
 
+# Page counts are reported under different keys depending on the endpoint's pagination helper.
+_TOTAL_PAGES_KEYS = ("totalPages", "total_pages", "pages", "lastPage")
+_TOTAL_COUNT_KEYS = ("total", "totalDocs", "totalCount", "count")
+
+def _get_total_pages(result: dict, page_size: int) -> int:
+    """Reads the number of result pages from a search response, falling back to 1 if it is not reported."""
+    for container in (result, result.get("data"), result.get("pagination"), result.get("meta")):
+        if not isinstance(container, dict):
+            continue
+        for key in _TOTAL_PAGES_KEYS:
+            if isinstance(container.get(key), int):
+                return container[key]
+        for key in _TOTAL_COUNT_KEYS:
+            if isinstance(container.get(key), int):
+                return -(-container[key] // page_size) # Ceiling division
+    return 1
+
+def search_trucking_orders_all(search_query: str = None, page_size: int = 50, max_pages: int = 10) -> dict:
+    """Fetches every page of a user's trucking orders (up to max_pages), requesting pages 2..N concurrently."""
+    first_page = search_trucking_orders(search_query=search_query, limit=page_size, page=1)
+    if first_page.get("error"):
+        return first_page
+    total_pages = _get_total_pages(first_page, page_size)
+    last_page = min(total_pages, max_pages)
+    pages = [first_page]
+    if last_page > 1:
+        # The page count is known after page 1, so the remaining pages are independent requests;
+        # they share the pooled SESSION connections instead of waiting on each other's round-trips.
+        # Each page runs in its own copy of this context so the worker threads see the bound auth session.
+        with ThreadPoolExecutor(max_workers=last_page - 1) as executor:
+            pages += executor.map(
+                lambda context, page: context.run(search_trucking_orders, search_query=search_query, limit=page_size, page=page),
+                [contextvars.copy_context() for _ in range(2, last_page + 1)],
+                range(2, last_page + 1),
+            )
+    return {"success": True, "total_pages": total_pages, "pages_fetched": len(pages), "pages": pages}
+
 def search_bookings(search_query: str = None, type_vehicle: str = None, type_shipping: str = None, done: bool = None, limit: int = 10, page: int = 1) -> dict:
     """Calls the Node.js API for advanced search of a user's bookings."""
-    if not AUTH_TOKEN:
+    if not _current_auth_session()["token"]:
         return {"error": True, "message": "You must be logged in to perform this action."}
     endpoint = f"{API_BASE_URL}/booking"
     params = {"limit": limit, "page": page}
@@ -237,9 +404,9 @@ def search_bookings(search_query: str = None, type_vehicle: str = None, type_shi
         params["typeShipping"] = type_shipping
     if done is not None:
         params["done"] = str(done).lower()
-    logger.info(f"Calling API: GET {endpoint} with params: {params}")
+    logger.info("Calling API: GET %s with params: %s", endpoint, params)
     try:
-        response = requests.get(endpoint, params=params, headers=_get_auth_headers(), timeout=15)
+        response = SESSION.get(endpoint, params=params, headers=_get_auth_headers(), timeout=15)
         return _handle_response(response, "search_bookings")
     except requests.exceptions.Timeout:
         logger.error(f"Timeout calling {endpoint}")
@@ -247,12 +414,12 @@ def search_bookings(search_query: str = None, type_vehicle: str = None, type_shi
 
 def create_trucking_order(payload: dict) -> dict:
     """Calls the Node.js API to convert a quote into a booked order."""
-    if not AUTH_TOKEN:
+    if not _current_auth_session()["token"]:
         return {"error": True, "message": "You must be logged in to book a shipment."}
     endpoint = f"{API_BASE_URL}/trucking"
-    logger.info(f"Calling API: POST {endpoint} to create an order.")
+    logger.info("Calling API: POST %s to create an order.", endpoint)
     try:
-        response = requests.post(endpoint, json=payload, headers=_get_auth_headers(), timeout=20)
+        response = SESSION.post(endpoint, data=orjson.dumps(payload), headers=_get_auth_headers(), timeout=20)
         return _handle_response(response, "create_trucking_order")
     except requests.exceptions.Timeout:
         logger.error(f"Timeout calling {endpoint}")
@@ -0,0 +1,99 @@
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+from pathlib import Path
+
+from google.adk import __version__ as ADK_VERSION
+from google.adk.tools import FunctionTool
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Function declarations precomputed by scripts/precompile_tool_schemas.py. They are only used when
+# ADK_USE_SCHEMA_CACHE=1, and only for tools whose source, docstring, ADK version and API backend still
+# match. The file is plain JSON and each declaration is validated when it is used, so a stale or edited
+# file can only fall back to introspection.
+# PlannerAgentADK and dock-experiment each ship an identical copy of this module, since each agent is
+# deployed on its own; tests/test_tool_schema_cache.py checks that the copies match.
+SCHEMA_CACHE_PATH = Path(__file__).with_name("tool_schemas.json")
+ADK_USE_SCHEMA_CACHE = os.getenv("ADK_USE_SCHEMA_CACHE", "0").strip() == "1"
+
+
+class CachedFunctionTool(FunctionTool):
+    """A FunctionTool that builds its function declaration at most once, or reuses a precomputed one."""
+
+    def __init__(self, func, declaration=None):
+        super().__init__(func=func)
+        self._declaration = declaration
+
+    def _get_declaration(self):
+        # FunctionTool introspects the signature and docstring on every model request; the result never changes.
+        if self._declaration is None:
+            self._declaration = super()._get_declaration()
+        return self._declaration
+
+
+def _fingerprint(func) -> str | None:
+    """Hashes what a tool's declaration is built from; returns None if the source cannot be read."""
+    try:
+        source = inspect.getsource(inspect.unwrap(func))
+    except (OSError, TypeError):
+        return None
+    # The docstring is included separately because some tools set it at runtime. Vertex AI and the Gemini
+    # API get different declarations from ADK, so the backend is part of the fingerprint too.
+    api_variant = "vertexai" if os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "").strip().lower() in ("true", "1") else "gemini"
+    payload = "\0".join([ADK_VERSION, api_variant, func.__name__, func.__doc__ or "", source])
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cache_key(func) -> str:
+    """Names a tool in the cache file."""
+    return f"{func.__module__}.{func.__name__}"
+
+
+@functools.cache
+def _load_schema_cache() -> dict:
+    """Reads the precomputed declarations on first call; returns an empty cache if the file is missing or unreadable."""
+    try:
+        with open(SCHEMA_CACHE_PATH, "rb") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable tool schema cache {SCHEMA_CACHE_PATH}: {e}")
+        return {}
+
+
+def make_function_tool(func) -> FunctionTool:
+    """Wraps func in a FunctionTool, using its precomputed declaration when the schema cache is enabled and fresh."""
+    declaration = None
+    if ADK_USE_SCHEMA_CACHE:
+        entry = _load_schema_cache().get(_cache_key(func))
+        fingerprint = _fingerprint(func)
+        if isinstance(entry, dict) and fingerprint is not None and entry.get("fingerprint") == fingerprint:
+            try:
+                declaration = types.FunctionDeclaration.model_validate(entry.get("declaration"))
+            except ValueError as e: # pydantic's ValidationError is a ValueError
+                logger.warning(f"Ignoring invalid cached schema for {func.__name__}: {e}")
+        if declaration is None:
+            logger.info(f"No fresh cached schema for {func.__name__}; building it from the function.")
+    return CachedFunctionTool(func, declaration=declaration)
+
+
+def write_schema_cache(funcs) -> int:
+    """Builds the declaration of every function and writes them to SCHEMA_CACHE_PATH; returns the number written."""
+    cache = {
+        _cache_key(func): {
+            "fingerprint": _fingerprint(func),
+            "declaration": FunctionTool(func=func)._get_declaration().model_dump(mode="json", exclude_none=True),
+        }
+        for func in funcs
+    }
+    with open(SCHEMA_CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    logger.info(f"Wrote {len(cache)} tool schemas to {SCHEMA_CACHE_PATH}.")
+    return len(cache)
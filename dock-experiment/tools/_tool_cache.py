@@ -0,0 +1,117 @@
+import copy
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+logger = logging.getLogger(__name__)
+
+
+# Tool TTLs, chosen by how often the upstream data can change.
+QUOTE_TTL_SECONDS = 5 * 60
+VEHICLE_CATALOG_TTL_SECONDS = 24 * 60 * 60
+VIN_SPECS_TTL_SECONDS = 7 * 24 * 60 * 60 # A VIN always decodes to the same vehicle
+USER_SEARCH_TTL_SECONDS = 30 # Only absorbs repeats within a turn or two; bookings clear it explicitly
+
+
+class _InFlightCall:
+    """A tool call that is running; concurrent callers with the same arguments wait for its result."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def cached_tool(ttl: float = 300, maxsize: int = 2048, key=None, is_cacheable=None):
+    """Caches a read-only tool's successful results for `ttl` seconds, keyed on its arguments.
+
+    At most `maxsize` results are kept; the least recently used one is evicted first. Concurrent
+    cache misses with the same arguments (e.g. two sessions asking about the same VIN) share a
+    single upstream call instead of each making their own. Every caller gets its own copy of the
+    result, so a caller that modifies it cannot change what other sessions are served.
+    Error results are not cached, so a failed lookup is retried on the next call. The wrapper
+    keeps the tool's name, docstring and signature, so FunctionTool describes it unchanged.
+
+    `key`, if given, is called with the tool's arguments and returns the cache key to use instead,
+    e.g. to normalize spelling or to include the logged-in user. `is_cacheable`, if given, is called
+    with each non-error result and decides whether it is stored.
+    The wrapper's cache_clear() drops every stored result, e.g. after a write the results depend on.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def default_key(*args, **kwargs):
+            # Binding to the signature gives positional and keyword calls (and explicit defaults) the same key;
+            # surrounding whitespace in string arguments does not change the lookup either.
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {name: value.strip() if isinstance(value, str) else value for name, value in bound.arguments.items()}
+            return json.dumps(arguments, sort_keys=True, default=str)
+
+        make_key = key or default_key
+        cache: OrderedDict[Hashable, tuple[float, dict]] = OrderedDict()
+        inflight: dict[Hashable, _InFlightCall] = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = make_key(*args, **kwargs)
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(cache_key)
+                is_hit = entry is not None and now - entry[0] < ttl
+                if is_hit:
+                    cache.move_to_end(cache_key)
+                else:
+                    call = inflight.get(cache_key)
+                    is_leader = call is None
+                    if is_leader:
+                        call = inflight[cache_key] = _InFlightCall()
+
+            if is_hit:
+                # Stored results are never modified, so the copy is taken outside the lock.
+                logger.debug("Tool cache hit for %s: %s", func.__name__, cache_key)
+                return copy.deepcopy(entry[1])
+
+            if not is_leader:
+                logger.debug("Waiting on in-flight call to %s: %s", func.__name__, cache_key)
+                call.done.wait()
+                if call.error is not None:
+                    raise call.error
+                return copy.deepcopy(call.result)
+
+            try:
+                result = func(*args, **kwargs)
+                # The cache and the waiters get a copy taken before the leader's caller can modify the result.
+                call.result = copy.deepcopy(result)
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with lock:
+                    del inflight[cache_key]
+                    if (call.error is None and isinstance(call.result, dict) and not call.result.get("error")
+                            and (is_cacheable is None or is_cacheable(call.result))):
+                        # Drop expired entries while we hold the lock so the cache does not grow unbounded.
+                        for stale_key in [k for k, (stored_at, _) in cache.items() if now - stored_at >= ttl]:
+                            del cache[stale_key]
+                        cache[cache_key] = (now, call.result)
+                        cache.move_to_end(cache_key)
+                        while len(cache) > maxsize:
+                            cache.popitem(last=False)
+                call.done.set()
+            return result
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
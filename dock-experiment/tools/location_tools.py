@@ -1,8 +1,25 @@
-import pgeocode
-from typing import Optional, Dict, Any
+import functools
+import sys
 
-# Initialize the geocoder for the US
-nomi = pgeocode.Nominatim('us')
+from typing import Optional, Dict, Any, List, Tuple
+
+@functools.cache
+def _get_zip_table() -> Dict[str, Tuple[str, str]]:
+    """Builds a ZIP code -> (city, state) table from pgeocode's US data on first call."""
+    # query_postal_code filters a pandas DataFrame on every call; with ~42k US ZIP codes it is cheaper to
+    # keep a dict and answer each lookup with a single hash probe. The table is built on the first lookup
+    # rather than at import, so agent startup does not wait on reading and parsing the GeoNames file.
+    # pgeocode downloads the GeoNames table on the first run and parses it into a pandas DataFrame.
+    # Only the two columns we need are copied out, so the DataFrame (tens of MB) can be freed.
+    import pgeocode # Imported here so pandas is only loaded once a ZIP code is looked up
+    data = pgeocode.Nominatim('us')._data_frame
+    # About 60 distinct states and far fewer cities than ZIP codes: interning stores each name once.
+    # pgeocode returns NaN for missing place names, so only rows with a real city are kept.
+    return {
+        postal_code: (sys.intern(place_name), sys.intern(state_name))
+        for postal_code, place_name, state_name in zip(data["postal_code"], data["place_name"], data["state_name"])
+        if isinstance(place_name, str)
+    }
 
 def get_location_from_zip(zip_code: str) -> Optional[Dict[str, Any]]:
     """
@@ -10,17 +27,18 @@ def get_location_from_zip(zip_code: str) -> Optional[Dict[str, Any]]:
     This function works offline and does not require an API key.
     """
     try:
-        query_result = nomi.query_postal_code(zip_code)
-
-        # pgeocode returns NaN for fields it can't find. We need to check for that.
-        if query_result.empty or not isinstance(query_result.place_name, str):
+        zip_code = zip_code.strip().zfill(5)
+        location = _get_zip_table().get(zip_code)
+        if location is None:
             return None
-
-        return {
-            "city": query_result.place_name,
-            "state": query_result.state_name,
-            "zip": query_result.postal_code
-        }
+        return {"city": location[0], "state": location[1], "zip": zip_code}
     except Exception as e:
         print(f"Error looking up zip code with pgeocode: {e}")
-        return None 
\ No newline at end of file
+        return None
+
+def get_locations_from_zips(zip_codes: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Looks up the city and state for several US ZIP codes at once (e.g., the pickup and delivery ZIPs).
+    Returns a mapping from each ZIP code to its location, or to null if the ZIP code is unknown.
+    """
+    return {zip_code: get_location_from_zip(zip_code) for zip_code in zip_codes}
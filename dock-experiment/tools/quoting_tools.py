@@ -1,8 +1,94 @@
 from ..services import node_api_service
+from ._tool_cache import QUOTE_TTL_SECONDS, cached_tool
+import functools
 import logging
+from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# The quote request body. orjson serializes (slotted) dataclasses natively, in field order, so these are
+# sent as-is and each part is one compact slotted object instead of a dict. Field names are the API's.
+@dataclass(slots=True, frozen=True)
+class _QuoteStop:
+    """A quote's pickup or delivery stop."""
+    city: str
+    state: str
+    country: str
+    code: str
+
+@dataclass(slots=True, frozen=True)
+class _QuoteVehicle:
+    """A quote's vehicle, carried from stop 1 to stop 2."""
+    year: str
+    make: str
+    model: str
+    vehicleType: str
+    operable: bool
+    pickUpStopNumber: int = 1
+    dropOffStopNumber: int = 2
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class _QuotePayload:
+    Ip: str = "127.0.0.1"
+    firstname: str
+    lastname: str
+    email: str
+    country: str
+    state: str | None
+    city: str | None
+    offerPrice: str = "0"
+    stopNumber1: _QuoteStop
+    stopNumber2: _QuoteStop
+    vehicles: tuple[_QuoteVehicle, ...]
+
+# Contact details sent with quotes requested by users who are not logged in.
+_ANONYMOUS_QUOTE_USER = {
+    "firstname": "DockMind",
+    "lastname": "User",
+    "email": "quote@dockmind.ai",
+    "country": "USA",
+    "state": "CA",
+    "city": "Anytown",
+}
+
+# Contact fields taken from the logged-in user's record, with the value used when the record lacks one.
+_LOGGED_IN_USER_DEFAULTS = (
+    ("firstname", "Registered"),
+    ("lastname", "User"),
+    ("email", "quote@dockmind.ai"),
+    ("country", "USA"),
+    ("state", None), # Let it be None if not present
+    ("city", None), # Let it be None if not present
+)
+
+# Shared results for validation failures, returned by reference.
+_INVALID_OPERABLE_ERROR = {"error": True, "message": "Invalid value for vehicle_operable, must be true or false."}
+_INVALID_QUOTE_ID_ERROR = {"error": True, "message": "Invalid quote_id provided."}
+
+@functools.cache
+def _missing_value_error(name: str) -> dict:
+    """Returns the shared error result for a missing or invalid required parameter."""
+    return {"error": True, "message": f"Missing or invalid value for {name}."}
+
+def _quote_cache_key(
+    pickup_city, pickup_state, pickup_zip, pickup_country,
+    delivery_city, delivery_state, delivery_zip, delivery_country,
+    vehicle_year, vehicle_make, vehicle_model,
+    vehicle_type="SUV", vehicle_operable=True
+) -> tuple:
+    """Cache key for get_trucking_price_quote: the normalized request plus the user the quote is made for."""
+    normalized = tuple(
+        str(value).strip().lower() for value in (
+            pickup_city, pickup_state, pickup_zip, pickup_country,
+            delivery_city, delivery_state, delivery_zip, delivery_country,
+            vehicle_year, vehicle_make, vehicle_model, vehicle_type,
+        )
+    )
+    # The quote is requested in the user's name, so each user (and anonymous use) gets their own entries.
+    # The user is identified by a hash, since cache keys are logged.
+    return (node_api_service.get_user_cache_key(), *normalized, vehicle_operable)
+
+@cached_tool(ttl=QUOTE_TTL_SECONDS, key=_quote_cache_key, is_cacheable=lambda result: bool(result.get("quote")))
 def get_trucking_price_quote(
     pickup_city: str, pickup_state: str, pickup_zip: str, pickup_country: str,
     delivery_city: str, delivery_state: str, delivery_zip: str, delivery_country: str,
@@ -10,93 +96,63 @@ def get_trucking_price_quote(
     vehicle_type: str = "SUV", # Default or ask, ensure this matches API expectations or is derived
     vehicle_operable: bool = True
 ) -> dict:
-    """Gets a trucking price quote by providing pickup, delivery, and vehicle details."""
-    logger.info(f"Tool: get_trucking_price_quote called with: PU: {pickup_city}/{pickup_zip}, Del: {delivery_city}/{delivery_zip}, Veh: {vehicle_year} {vehicle_make} {vehicle_model}")
+    """Gets a trucking price quote by providing pickup, delivery, and vehicle details.
+    Before calling, make sure you have the pickup and delivery city, state and ZIP code, and the vehicle year, make and model.
+    For US-based queries, set pickup_country='USA' and delivery_country='USA' yourself.
+    After providing a quote, ask the user if they want to book the shipment."""
+    logger.info(
+        "Tool: get_trucking_price_quote called with: PU: %s/%s, Del: %s/%s, Veh: %s %s %s",
+        pickup_city, pickup_zip, delivery_city, delivery_zip, vehicle_year, vehicle_make, vehicle_model,
+    )
 
     # Validate required string parameters
-    required_strings = {
-        "pickup_city": pickup_city, "pickup_state": pickup_state, "pickup_zip": pickup_zip, "pickup_country": pickup_country,
-        "delivery_city": delivery_city, "delivery_state": delivery_state, "delivery_zip": delivery_zip, "delivery_country": delivery_country,
-        "vehicle_year": vehicle_year, "vehicle_make": vehicle_make, "vehicle_model": vehicle_model, "vehicle_type": vehicle_type
-    }
-    for name, val in required_strings.items():
-        if not val or not isinstance(val, str):
-            logger.error(f"Invalid or missing string value for '{name}' in get_trucking_price_quote")
-            return {"error": True, "message": f"Missing or invalid value for {name}."}
+    required_strings = (
+        ("pickup_city", pickup_city), ("pickup_state", pickup_state), ("pickup_zip", pickup_zip), ("pickup_country", pickup_country),
+        ("delivery_city", delivery_city), ("delivery_state", delivery_state), ("delivery_zip", delivery_zip), ("delivery_country", delivery_country),
+        ("vehicle_year", vehicle_year), ("vehicle_make", vehicle_make), ("vehicle_model", vehicle_model), ("vehicle_type", vehicle_type)
+    )
+    for name, val in required_strings:
+        if not isinstance(val, str) or not val:
+            logger.error("Invalid or missing string value for '%s' in get_trucking_price_quote", name)
+            return _missing_value_error(name)
     
     if not isinstance(vehicle_operable, bool):
-        logger.error(f"Invalid value for 'vehicle_operable', must be boolean.")
-        return {"error": True, "message": "Invalid value for vehicle_operable, must be true or false."}
+        logger.error("Invalid value for 'vehicle_operable', must be boolean.")
+        return _INVALID_OPERABLE_ERROR
 
     # Dynamically set user details based on login state
     current_user = node_api_service.get_current_user_data()
     if current_user:
-        logger.info(f"User is logged in as {current_user.get('email')}. Using their details for the quote.")
-        user_firstname = current_user.get("firstname", "Registered")
-        user_lastname = current_user.get("lastname", "User")
-        user_email = current_user.get("email", "quote@dockmind.ai")
-        user_country = current_user.get("country", "USA")
-        user_state = current_user.get("state") # Let it be None if not present
-        user_city = current_user.get("city") # Let it be None if not present
+        logger.info("User is logged in as %s. Using their details for the quote.", current_user.get('email'))
+        user_fields = {field: current_user.get(field, default) for field, default in _LOGGED_IN_USER_DEFAULTS}
     else:
         logger.info("User is not logged in. Using anonymous details for the quote.")
-        user_firstname = "DockMind"
-        user_lastname = "User"
-        user_email = "quote@dockmind.ai"
-        user_country = "USA"
-        user_state = "CA"
-        user_city = "Anytown"
-
-    payload = {
-        "Ip": "127.0.0.1", 
-        "firstname": user_firstname,
-        "lastname": user_lastname,
-        "email": user_email,
-        "country": user_country, 
-        "state": user_state,   
-        "city": user_city,    
-        "offerPrice": "0",
-        "stopNumber1": {
-            "city": pickup_city,
-            "state": pickup_state,
-            "country": pickup_country,
-            "code": pickup_zip
-        },
-        "stopNumber2": {
-            "city": delivery_city,
-            "state": delivery_state,
-            "country": delivery_country,
-            "code": delivery_zip
-        },
-        "vehicles": [
-            {
-                "year": vehicle_year,
-                "make": vehicle_make,
-                "model": vehicle_model,
-                "vehicleType": vehicle_type,
-                "operable": vehicle_operable,
-                "pickUpStopNumber": 1,
-                "dropOffStopNumber": 2
-            }
-        ]
-    }
-    
-    logger.debug(f"Submitting quote payload: {payload}")
+        user_fields = _ANONYMOUS_QUOTE_USER
+
+    payload = _QuotePayload(
+        **user_fields,
+        stopNumber1=_QuoteStop(pickup_city, pickup_state, pickup_country, pickup_zip),
+        stopNumber2=_QuoteStop(delivery_city, delivery_state, delivery_country, delivery_zip),
+        vehicles=(_QuoteVehicle(vehicle_year, vehicle_make, vehicle_model, vehicle_type, vehicle_operable),),
+    )
+
+    logger.debug("Submitting quote payload: %r", payload)
     result = node_api_service.submit_for_quote(payload)
     if result.get("error"):
-        logger.error(f"API error in submit_for_quote: {result.get('message')}")
+        logger.error("API error in submit_for_quote: %s", result.get('message'))
     elif not result.get("quote"):
-        logger.warning(f"submit_for_quote API response did not contain a 'quote' ID. Response: {result}")
+        logger.warning("submit_for_quote API response did not contain a 'quote' ID. Response: %s", result)
 
     return result
 
+@cached_tool(ttl=QUOTE_TTL_SECONDS)
 def get_quote_details_by_id(quote_id: str) -> dict:
     """Fetches the full details of a previously generated quote using its unique quote ID."""
-    logger.info(f"Tool: get_quote_details_by_id called for quote_id: {quote_id}")
+    logger.info("Tool: get_quote_details_by_id called for quote_id: %s", quote_id)
     if not quote_id or not isinstance(quote_id, str):
         logger.error("Invalid quote_id provided to get_quote_details_by_id.")
-        return {"error": True, "message": "Invalid quote_id provided."}
+        return _INVALID_QUOTE_ID_ERROR
     result = node_api_service.fetch_quote_details(quote_id)
     if result.get("error"):
-        logger.error(f"API error fetching quote details for ID {quote_id}: {result.get('message')}")
+        logger.error("API error fetching quote details for ID %s: %s", quote_id, result.get('message'))
     return result 
\ No newline at end of file
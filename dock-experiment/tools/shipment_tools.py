@@ -1,4 +1,5 @@
 from ..services import node_api_service
+from ._tool_cache import USER_SEARCH_TTL_SECONDS, cached_tool
 import logging
 from typing import Optional
 
@@ -22,15 +23,40 @@ STATE_ABBREVIATIONS = {
 
 def _get_state_abbr(state_name: str) -> str:
     """Converts a full state name to its 2-letter abbreviation, case-insensitively."""
+    if len(state_name) == 2:
+        return state_name.upper() # Already an abbreviation (no state name is two letters long)
     return STATE_ABBREVIATIONS.get(state_name.lower(), state_name)
 
+def _build_stop(city, state, zip_code, forklift, address1, address2, phone, location_type) -> dict:
+    """Builds a booking's origin or destination; optional fields are only included when they have a value."""
+    optional = {"address1": address1, "address2": address2, "phone": phone, "LocationType": location_type}
+    return {"city": city, "state": state, "zip": zip_code, "forklift": forklift, **{k: v for k, v in optional.items() if v}}
+
+def _normalize_query(search_query: Optional[str]) -> Optional[str]:
+    """Treats an empty or whitespace-only search query as no query (list everything)."""
+    return (search_query or "").strip() or None
+
+# Search results belong to the logged-in user, so the cache keys start with the login they were fetched for.
+def _shipment_search_key(search_query: Optional[str] = None) -> tuple:
+    return (node_api_service.get_auth_cache_key(), _normalize_query(search_query))
+
+def _booking_search_key(search_query=None, type_vehicle=None, type_shipping=None, is_completed=None) -> tuple:
+    return (node_api_service.get_auth_cache_key(), _normalize_query(search_query), type_vehicle, type_shipping, is_completed)
+
+@cached_tool(ttl=USER_SEARCH_TTL_SECONDS, key=_shipment_search_key)
 def search_user_shipments(search_query: Optional[str] = None) -> dict:
     """Searches a logged-in user's shipments. A search query can be provided to filter results."""
-    logger.info(f"Tool: search_user_shipments called with query: '{search_query}'.")
+    logger.info("Tool: search_user_shipments called with query: '%s'.", search_query)
     # This simplified tool uses the basic /api/trucking search.
     # The agent can be taught to use the more advanced one if needed.
-    return node_api_service.search_trucking_orders(search_query=search_query)
+    return node_api_service.search_trucking_orders(search_query=_normalize_query(search_query))
+
+def list_all_user_shipments(search_query: Optional[str] = None) -> dict:
+    """Fetches a logged-in user's complete shipment history (all result pages) in one call. A search query can be provided to filter results."""
+    logger.info("Tool: list_all_user_shipments called with query: '%s'.", search_query)
+    return node_api_service.search_trucking_orders_all(search_query=_normalize_query(search_query))
 
+@cached_tool(ttl=USER_SEARCH_TTL_SECONDS, key=_booking_search_key)
 def search_user_bookings_advanced(
     search_query: Optional[str] = None,
     type_vehicle: Optional[str] = None,
@@ -38,9 +64,12 @@ def search_user_bookings_advanced(
     is_completed: Optional[bool] = None
 ) -> dict:
     """Performs an advanced search on a user's bookings with multiple optional filters."""
-    logger.info(f"Tool: search_user_bookings_advanced called with query: '{search_query}', type_vehicle: '{type_vehicle}', type_shipping: '{type_shipping}', is_completed: {is_completed}")
+    logger.info(
+        "Tool: search_user_bookings_advanced called with query: '%s', type_vehicle: '%s', type_shipping: '%s', is_completed: %s",
+        search_query, type_vehicle, type_shipping, is_completed,
+    )
     return node_api_service.search_bookings(
-        search_query=search_query,
+        search_query=_normalize_query(search_query),
         type_vehicle=type_vehicle,
         type_shipping=type_shipping,
         done=is_completed
@@ -74,45 +103,28 @@ def create_trucking_shipment(
     vehicle_qty: int = 1
 ) -> dict:
     """
-    Creates a new trucking shipment. This is used to book a vehicle transport.
-    The agent should guide the user to collect all necessary information.
+    Creates a new trucking shipment. This is used to book a vehicle transport for a logged-in user who has a quote.
+    The agent should guide the user to collect all necessary information. Besides the quote's locations and vehicle,
+    you MUST have all of these before calling: available_date (YYYY-MM-DD), trailer_type (e.g., 'Open' or 'Enclosed'),
+    offer_price, total_price, cod_amount and vehicle_type (e.g., 'car', 'suv', 'pickup').
+    If the conversation was interrupted (e.g., by logging in), re-confirm these before calling.
+    Do not ask for optional fields such as origin_address1 or pickup_instructions.
     If a user provides a ZIP code, use the 'get_location_from_zip' tool to get city and state.
     """
-    logger.info(f"Tool: create_trucking_shipment called for {vehicle_year} {vehicle_make} {vehicle_model}.")
+    logger.info("Tool: create_trucking_shipment called for %s %s %s.", vehicle_year, vehicle_make, vehicle_model)
 
     origin_state_abbr = _get_state_abbr(origin_state)
     destination_state_abbr = _get_state_abbr(destination_state)
 
-    origin = {
-        "city": origin_city,
-        "state": origin_state_abbr,
-        "zip": origin_zip,
-        "forklift": origin_forklift
-    }
-    if origin_address1:
-        origin["address1"] = origin_address1
-    if origin_address2:
-        origin["address2"] = origin_address2
-    if origin_phone:
-        origin["phone"] = origin_phone
-    if origin_location_type:
-        origin["LocationType"] = origin_location_type
+    origin = _build_stop(
+        origin_city, origin_state_abbr, origin_zip, origin_forklift,
+        origin_address1, origin_address2, origin_phone, origin_location_type
+    )
+    destination = _build_stop(
+        destination_city, destination_state_abbr, destination_zip, destination_forklift,
+        destination_address1, destination_address2, destination_phone, destination_location_type
+    )
 
-    destination = {
-        "city": destination_city,
-        "state": destination_state_abbr,
-        "zip": destination_zip,
-        "forklift": destination_forklift
-    }
-    if destination_address1:
-        destination["address1"] = destination_address1
-    if destination_address2:
-        destination["address2"] = destination_address2
-    if destination_phone:
-        destination["phone"] = destination_phone
-    if destination_location_type:
-        destination["LocationType"] = destination_location_type
-    
     payload = {
         "origin": origin,
         "destination": destination,
@@ -141,5 +153,10 @@ def create_trucking_shipment(
     if pickup_instructions:
         payload["PickupInstructions"] = pickup_instructions
 
-    logger.debug(f"Submitting booking payload: {payload}")
-    return node_api_service.create_trucking_order(payload) 
\ No newline at end of file
+    logger.debug("Submitting booking payload: %r", payload)
+    result = node_api_service.create_trucking_order(payload)
+    if not result.get("error"):
+        # The new order must show up in the user's next search.
+        search_user_shipments.cache_clear()
+        search_user_bookings_advanced.cache_clear()
+    return result 
\ No newline at end of file
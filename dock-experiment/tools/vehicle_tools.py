@@ -1,54 +1,94 @@
 from ..services import node_api_service
+from ._tool_cache import VEHICLE_CATALOG_TTL_SECONDS, VIN_SPECS_TTL_SECONDS, cached_tool
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+_YEAR_RE = re.compile(r"[0-9]{4}")
+
+# Validation failures return these shared results rather than building a new dict each time;
+# tool results are only read after they are returned, never modified.
+_INVALID_YEAR_ERROR = {"error": True, "message": "Invalid year provided. Must be a 4-digit string."}
+_INVALID_VIN_ERROR = {"error": True, "message": "Invalid VIN provided."}
+_INVALID_MAKE_ERROR = {"error": True, "message": "Invalid make provided."}
+_INVALID_MODEL_ERROR = {"error": True, "message": "Invalid model provided."}
+
+def _validate_year(year, tool_name: str) -> Optional[dict]:
+    """Returns an error result if year is not a 4-digit string, otherwise None."""
+    if isinstance(year, str) and _YEAR_RE.fullmatch(year):
+        return None
+    logger.error(f"Invalid year provided to {tool_name}. Must be a 4-digit string.")
+    return _INVALID_YEAR_ERROR
+
+@cached_tool(ttl=VIN_SPECS_TTL_SECONDS)
 def get_vehicle_specs_by_vin(vin: str) -> dict:
     """Fetches detailed vehicle specifications based on its Vehicle Identification Number (VIN)."""
     logger.info(f"Tool: get_vehicle_specs_by_vin called for VIN: {vin}")
     if not vin or not isinstance(vin, str):
         logger.error("Invalid VIN provided to get_vehicle_specs_by_vin.")
-        return {"error": True, "message": "Invalid VIN provided."}
+        return _INVALID_VIN_ERROR
     result = node_api_service.fetch_vehicle_specs(vin)
     if result.get("error"):
         logger.error(f"API error fetching vehicle specs for VIN {vin}: {result.get('message')}")
     return result
 
+@cached_tool(ttl=VEHICLE_CATALOG_TTL_SECONDS)
 def get_vehicle_makes_for_year(year: str) -> dict:
     """Lists available vehicle makes for a given year. The year should be a 4-digit number."""
     logger.info(f"Tool: get_vehicle_makes_for_year called for year: {year}")
-    if not year or not (isinstance(year, str) and year.isdigit() and len(year) == 4):
-        logger.error("Invalid year provided to get_vehicle_makes_for_year. Must be a 4-digit string.")
-        return {"error": True, "message": "Invalid year provided. Must be a 4-digit string."}
+    year_error = _validate_year(year, "get_vehicle_makes_for_year")
+    if year_error:
+        return year_error
     result = node_api_service.fetch_vehicle_makes(year)
     if result.get("error"):
         logger.error(f"API error fetching vehicle makes for year {year}: {result.get('message')}")
     return result
 
+@cached_tool(ttl=VEHICLE_CATALOG_TTL_SECONDS)
 def get_vehicle_models_for_make_year(make: str, year: str) -> dict:
     """Lists available vehicle models for a given make and year. The year should be a 4-digit number."""
     logger.info(f"Tool: get_vehicle_models_for_make_year called for make: {make}, year: {year}")
     if not make or not isinstance(make, str):
         logger.error("Invalid make provided to get_vehicle_models_for_make_year.")
-        return {"error": True, "message": "Invalid make provided."}
-    if not year or not (isinstance(year, str) and year.isdigit() and len(year) == 4):
-        logger.error("Invalid year provided to get_vehicle_models_for_make_year. Must be a 4-digit string.")
-        return {"error": True, "message": "Invalid year provided. Must be a 4-digit string."}
+        return _INVALID_MAKE_ERROR
+    year_error = _validate_year(year, "get_vehicle_models_for_make_year")
+    if year_error:
+        return year_error
     result = node_api_service.fetch_vehicle_models(make, year)
     if result.get("error"):
         logger.error(f"API error fetching models for make {make}, year {year}: {result.get('message')}")
     return result
 
+@cached_tool(ttl=VEHICLE_CATALOG_TTL_SECONDS)
 def get_vehicle_years_for_make_model(make: str, model: str) -> dict:
     """Lists available model years for a given make and model."""
     logger.info(f"Tool: get_vehicle_years_for_make_model called for make: {make}, model: {model}")
     if not make or not isinstance(make, str):
         logger.error("Invalid make provided to get_vehicle_years_for_make_model.")
-        return {"error": True, "message": "Invalid make provided."}
+        return _INVALID_MAKE_ERROR
     if not model or not isinstance(model, str):
         logger.error("Invalid model provided to get_vehicle_years_for_make_model.")
-        return {"error": True, "message": "Invalid model provided."}
+        return _INVALID_MODEL_ERROR
     result = node_api_service.fetch_vehicle_years(make, model)
     if result.get("error"):
         logger.error(f"API error fetching years for make {make}, model {model}: {result.get('message')}")
-    return result 
\ No newline at end of file
+    return result
+
+def get_vehicle_catalog_bundle(year: str, make: Optional[str] = None, model: Optional[str] = None) -> dict:
+    """Looks up the vehicle catalog in one call: the makes for a year, plus the models for the make and year
+    if a make is given, and the model years for the make and model if both are given.
+    Prefer this over calling the separate make, model and year lookups one after another."""
+    logger.info(f"Tool: get_vehicle_catalog_bundle called for year: {year}, make: {make}, model: {model}")
+    lookups = {"makes": (get_vehicle_makes_for_year, (year,))}
+    if make:
+        lookups["models"] = (get_vehicle_models_for_make_year, (make, year))
+        if model:
+            lookups["years"] = (get_vehicle_years_for_make_model, (make, model))
+    # The API has no bulk endpoint, so the lookups run concurrently over the pooled session. They go through
+    # the cached tools, so later calls to the individual tools with the same arguments are answered from memory.
+    with ThreadPoolExecutor(max_workers=len(lookups)) as executor:
+        futures = {name: executor.submit(func, *args) for name, (func, args) in lookups.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,34 @@
+"""Precomputes the FunctionTool declarations of the planner and DockMind agents.
+
+Run from the repository root after changing a tool:
+
+    python scripts/precompile_tool_schemas.py
+
+The agents only use the result when ADK_USE_SCHEMA_CACHE=1. A tool whose source or docstring changed
+since the cache was written, or any tool after an ADK upgrade or a switch between Vertex AI and the
+Gemini API, is introspected live as before.
+"""
+import importlib
+import logging
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    # Each package keeps its own tool_schemas.json next to its tool_schema_cache module.
+    planner_agent = importlib.import_module("PlannerAgentADK.adk_planner_agent")
+    planner_cache = importlib.import_module("PlannerAgentADK.tool_schema_cache")
+    planner_cache.write_schema_cache(planner_agent._tool_functions())
+
+    dock_agent = importlib.import_module("dock-experiment.dock_agent")
+    dock_cache = importlib.import_module("dock-experiment.tool_schema_cache")
+    dock_cache.write_schema_cache(dock_agent.TOOL_FUNCTIONS + (dock_agent.batch, dock_agent.discover_tools))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from PlannerAgentADK.adk_file_io_tool import FileIOTool
+
+
+class FileIOToolBaseDirectoryTests(unittest.TestCase):
+    def setUp(self):
+        self.base_directory = os.path.join(tempfile.mkdtemp(), "files")
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.base_directory), ignore_errors=True)
+
+    def test_write_recreates_a_deleted_base_directory(self):
+        tool = FileIOTool(base_directory=self.base_directory)
+        shutil.rmtree(self.base_directory)
+
+        # A second tool for the same directory finds it in the prepared cache and skips makedirs.
+        tool = FileIOTool(base_directory=self.base_directory)
+        self.assertTrue(tool.write_to_file("a.txt", "hello").startswith("Content written"))
+        self.assertEqual(tool.read_file_content("a.txt"), "hello")
+
+    def test_append_recreates_a_deleted_base_directory(self):
+        tool = FileIOTool(base_directory=self.base_directory)
+        self.addCleanup(tool.close)
+        shutil.rmtree(self.base_directory)
+
+        self.assertTrue(tool.append_to_file("log.txt", "one").startswith("Content appended"))
+        self.assertEqual(tool.read_file_content("log.txt"), "one")
+
+
+class FileIOToolAppendTests(unittest.TestCase):
+    def setUp(self):
+        self.base_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base_directory, ignore_errors=True)
+        self.tool = FileIOTool(base_directory=self.base_directory)
+        self.addCleanup(self.tool.close)
+
+    def test_append_after_external_delete_creates_a_new_file(self):
+        self.tool.append_to_file("log.txt", "one")
+        os.remove(os.path.join(self.base_directory, "log.txt"))
+        self.tool.append_to_file("log.txt", "two")
+        self.assertEqual(self.tool.read_file_content("log.txt"), "two")
+
+    def test_append_after_external_replace_goes_to_the_new_file(self):
+        self.tool.append_to_file("log.txt", "one")
+        replacement = os.path.join(self.base_directory, "replacement.txt")
+        with open(replacement, "w", encoding="utf-8") as f:
+            f.write("new:")
+        os.replace(replacement, os.path.join(self.base_directory, "log.txt"))
+        self.tool.append_to_file("log.txt", "two")
+        self.assertEqual(self.tool.read_file_content("log.txt"), "new:two")
+
+
+if __name__ == "__main__":
+    unittest.main()
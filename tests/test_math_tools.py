@@ -0,0 +1,98 @@
+import importlib
+import os
+import sys
+import time
+import unittest
+
+from PlannerAgentADK import _math_eval, adk_math_tool
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(_REPO_ROOT, "Azure"))
+
+
+def _load_azure_math_plugin():
+    """Returns the Semantic Kernel math plugin module, or None if semantic_kernel is not installed."""
+    try:
+        return importlib.import_module("math_plugin")
+    except ImportError:
+        return None
+
+
+class MathEvaluatorGuardTests:
+    """Checks shared by the ADK and Semantic Kernel math evaluators; `solve` is set by subclasses."""
+
+    def assert_rejected_quickly(self, expression):
+        started = time.monotonic()
+        result = self.solve(expression)
+        self.assertTrue(result.startswith("Could not solve:"), result)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+    def test_simple_expression(self):
+        self.assertEqual(self.solve("(5 + 3) * 2 / 4 - 1"), "(5 + 3) * 2 / 4 - 1 = 3.0")
+
+    def test_large_exponent_is_rejected(self):
+        self.assert_rejected_quickly("9 ** 9 ** 9")
+
+    def test_nested_powers_are_rejected(self):
+        self.assert_rejected_quickly("(9**9999)**9999")
+
+    def test_product_of_large_powers_is_rejected(self):
+        self.assert_rejected_quickly("(9**9999)*(9**9999)*(9**9999)*(9**9999)")
+
+    def test_result_too_long_to_print_is_rejected(self):
+        # 10 ** 5000 has 5,001 digits, more than Python will convert to str by default.
+        result = self.solve("10 ** 5000")
+        self.assertIn("Result is too large.", result)
+        self.assertIn("Result is too large.", self.solve("(10 ** 2500) * (10 ** 2500)"))
+
+    def test_small_powers_still_work(self):
+        self.assertEqual(self.solve("2 ** 10"), "2 ** 10 = 1024")
+        self.assertEqual(self.solve("2 ** -3"), "2 ** -3 = 0.125")
+
+    def test_split_operators_are_not_joined(self):
+        self.assertTrue(self.solve("5 * * 3").startswith("Could not solve:"))
+        self.assertTrue(self.solve("5 / / 2").startswith("Could not solve:"))
+
+    def test_formatting_variants_give_the_same_result(self):
+        self.assertEqual(self.solve("5+3"), "5+3 = 8")
+        self.assertEqual(self.solve("5 + 3"), "5 + 3 = 8")
+        self.assertEqual(self.solve("1e3 + 1"), "1e3 + 1 = 1001.0")
+
+
+class MathEvalModuleTests(unittest.TestCase):
+    def test_formatting_variants_share_a_cache_key(self):
+        self.assertEqual(
+            _math_eval._normalize_expression("(5+3)*2"),
+            _math_eval._normalize_expression(" ( 5 + 3 ) * 2 "),
+        )
+
+    def test_invalid_syntax_is_not_normalized_into_valid_syntax(self):
+        with self.assertRaises(SyntaxError):
+            _math_eval._normalize_expression("5 * * 3")
+
+    def test_largest_accepted_results_can_be_printed(self):
+        # Results just under the bit cap stay below the int-to-str digit limit.
+        self.assertLessEqual(len(str(_math_eval.evaluate_expression("2 ** 6999"))), sys.get_int_max_str_digits())
+        self.assertLessEqual(len(str(_math_eval.evaluate_expression("3 ** 6999"))), sys.get_int_max_str_digits())
+
+    def test_package_copies_are_identical(self):
+        def read(package):
+            with open(os.path.join(_REPO_ROOT, package, "_math_eval.py"), "rb") as f:
+                return f.read()
+
+        self.assertEqual(read("PlannerAgentADK"), read("Azure"))
+
+
+class AdkMathToolTests(MathEvaluatorGuardTests, unittest.TestCase):
+    def solve(self, expression):
+        return adk_math_tool.solve_math_expression(expression)
+
+
+@unittest.skipIf(_load_azure_math_plugin() is None, "semantic_kernel is not installed")
+class AzureMathPluginTests(MathEvaluatorGuardTests, unittest.TestCase):
+    def solve(self, expression):
+        return _load_azure_math_plugin().MathPlugin().solve(expression)
+
+
+if __name__ == "__main__":
+    unittest.main()
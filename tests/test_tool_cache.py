@@ -0,0 +1,205 @@
+import importlib.util
+import os
+import threading
+import unittest
+from unittest import mock
+
+_TOOL_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dock-experiment", "tools", "_tool_cache.py"
+)
+
+
+def _load_tool_cache():
+    """Loads _tool_cache.py on its own; the hyphenated dock-experiment directory is not importable by name."""
+    spec = importlib.util.spec_from_file_location("dock_tool_cache", _TOOL_CACHE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_tool_cache = _load_tool_cache()
+cached_tool = _tool_cache.cached_tool
+
+
+class CachedToolTests(unittest.TestCase):
+    def test_repeated_call_is_served_from_the_cache(self):
+        calls = []
+
+        @cached_tool()
+        def lookup(vin: str) -> dict:
+            calls.append(vin)
+            return {"vin": vin}
+
+        self.assertEqual(lookup("ABC"), {"vin": "ABC"})
+        self.assertEqual(lookup("ABC"), {"vin": "ABC"})
+        self.assertEqual(calls, ["ABC"])
+
+    def test_callers_cannot_modify_the_cached_result(self):
+        @cached_tool()
+        def lookup(vin: str) -> dict:
+            return {"vin": vin, "trims": ["base"]}
+
+        first = lookup("A")
+        first["trims"].append("changed by the leader")
+        second = lookup("A")
+        second["trims"].append("changed by a hit")
+        self.assertEqual(lookup("A"), {"vin": "A", "trims": ["base"]})
+
+    def test_positional_keyword_and_default_arguments_share_a_key(self):
+        calls = []
+
+        @cached_tool()
+        def search(query: str, limit: int = 10) -> dict:
+            calls.append((query, limit))
+            return {"results": []}
+
+        search("sedan")
+        search(query="sedan")
+        search("sedan", limit=10)
+        search(" sedan ")
+        self.assertEqual(len(calls), 1)
+        search("sedan", 20)
+        self.assertEqual(len(calls), 2)
+
+    def test_custom_key_and_is_cacheable(self):
+        calls = []
+
+        @cached_tool(key=lambda zip_code: zip_code.lower(), is_cacheable=lambda result: bool(result.get("quote")))
+        def quote(zip_code: str) -> dict:
+            calls.append(zip_code)
+            return {"quote": zip_code if zip_code != "none" else None}
+
+        quote("AB1")
+        quote("ab1")
+        self.assertEqual(calls, ["AB1"])
+        quote("none")
+        quote("none")
+        self.assertEqual(calls, ["AB1", "none", "none"])
+
+    def test_error_results_are_not_cached(self):
+        calls = []
+
+        @cached_tool()
+        def lookup(vin: str) -> dict:
+            calls.append(vin)
+            return {"error": True, "message": "upstream failed"}
+
+        lookup("ABC")
+        lookup("ABC")
+        self.assertEqual(len(calls), 2)
+
+    def test_entries_expire_after_the_ttl(self):
+        calls = []
+        clock = [1000.0]
+
+        @cached_tool(ttl=60)
+        def lookup(vin: str) -> dict:
+            calls.append(vin)
+            return {"vin": vin}
+
+        with mock.patch.object(_tool_cache.time, "monotonic", lambda: clock[0]):
+            lookup("ABC")
+            clock[0] += 59
+            lookup("ABC")
+            self.assertEqual(len(calls), 1)
+            clock[0] += 2
+            lookup("ABC")
+            self.assertEqual(len(calls), 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        calls = []
+
+        @cached_tool(maxsize=2)
+        def lookup(vin: str) -> dict:
+            calls.append(vin)
+            return {"vin": vin}
+
+        lookup("A")
+        lookup("B")
+        lookup("A") # A is now the most recently used
+        lookup("C") # Evicts B
+        self.assertEqual(calls, ["A", "B", "C"])
+        lookup("A")
+        self.assertEqual(calls, ["A", "B", "C"])
+        lookup("B")
+        self.assertEqual(calls, ["A", "B", "C", "B"])
+
+    def test_cache_clear_drops_stored_results(self):
+        calls = []
+
+        @cached_tool()
+        def lookup(vin: str) -> dict:
+            calls.append(vin)
+            return {"vin": vin}
+
+        lookup("A")
+        lookup.cache_clear()
+        lookup("A")
+        self.assertEqual(len(calls), 2)
+
+    def _start_waiters(self, func, count):
+        """Calls func("A") from `count` threads; returns the threads and a list collecting (result, error)."""
+        outcomes = []
+
+        def run():
+            try:
+                outcomes.append((func("A"), None))
+            except Exception as e:
+                outcomes.append((None, e))
+
+        threads = [threading.Thread(target=run) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, outcomes
+
+    def test_concurrent_misses_share_one_call(self):
+        release = threading.Event()
+        calls = []
+
+        @cached_tool()
+        def lookup(vin: str) -> dict:
+            calls.append(vin)
+            release.wait(5)
+            return {"vin": vin}
+
+        threads, outcomes = self._start_waiters(lookup, 5)
+        # Give every thread time to reach the cache and find the leader's call in flight.
+        threading.Event().wait(0.2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(calls, ["A"])
+        self.assertEqual(outcomes, [({"vin": "A"}, None)] * 5)
+        results = [result for result, _ in outcomes]
+        self.assertEqual(len({id(result) for result in results}), 5) # Each caller got its own dict
+
+    def test_leader_exception_reaches_the_waiters(self):
+        release = threading.Event()
+        calls = []
+
+        @cached_tool()
+        def lookup(vin: str) -> dict:
+            calls.append(vin)
+            release.wait(5)
+            raise RuntimeError("upstream exploded")
+
+        threads, outcomes = self._start_waiters(lookup, 4)
+        threading.Event().wait(0.2)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(calls, ["A"])
+        self.assertEqual(len(outcomes), 4)
+        for result, error in outcomes:
+            self.assertIsNone(result)
+            self.assertIsInstance(error, RuntimeError)
+
+        # The failure is not cached; the next call runs the tool again.
+        release.set()
+        with self.assertRaises(RuntimeError):
+            lookup("A")
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
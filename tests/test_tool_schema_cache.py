@@ -0,0 +1,18 @@
+import os
+import unittest
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ToolSchemaCacheCopiesTests(unittest.TestCase):
+    def test_agent_packages_ship_the_same_module(self):
+        # Each agent is deployed on its own, so each keeps a copy; they must not drift apart.
+        with open(os.path.join(_REPO_ROOT, "PlannerAgentADK", "tool_schema_cache.py"), "rb") as f:
+            planner_copy = f.read()
+        with open(os.path.join(_REPO_ROOT, "dock-experiment", "tool_schema_cache.py"), "rb") as f:
+            dock_copy = f.read()
+        self.assertEqual(planner_copy, dock_copy)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import importlib
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Azure"))
+
+
+def _load_azure_main():
+    """Returns the Semantic Kernel app module, or None if its dependencies are not installed."""
+    try:
+        return importlib.import_module("main")
+    except ImportError:
+        return None
+
+
+@unittest.skipIf(_load_azure_main() is None, "semantic_kernel is not installed")
+class ToolsSchemaTests(unittest.TestCase):
+    def setUp(self):
+        self.type_schema = _load_azure_main()._type_schema
+
+    def test_scalar_types(self):
+        self.assertEqual(self.type_schema("int"), {"type": "integer"})
+        self.assertEqual(self.type_schema("str | None"), {"type": "string"})
+        self.assertEqual(self.type_schema("SomethingElse"), {"type": "string"})
+
+    def test_list_of_strings(self):
+        # send_sms_batch's to_phones parameter.
+        self.assertEqual(self.type_schema("list[str]"), {"type": "array", "items": {"type": "string"}})
+
+    def test_list_of_string_pairs(self):
+        # write_files_batch's files parameter.
+        self.assertEqual(
+            self.type_schema("list[tuple[str, str]]"),
+            {
+                "type": "array",
+                "items": {"type": "array", "minItems": 2, "maxItems": 2, "items": {"type": "string"}},
+            },
+        )
+
+    def test_batch_sms_tool_takes_an_array(self):
+        main = _load_azure_main()
+        from semantic_kernel import Kernel
+
+        kernel = Kernel()
+        kernel.add_plugin(main.SmsPlugin(), plugin_name="SmsSender")
+        tools = {tool["function"]["name"]: tool for tool in main._build_tools_schema(kernel)}
+        to_phones = tools["SmsSender_send_sms_batch"]["function"]["parameters"]["properties"]["to_phones"]
+        self.assertEqual(to_phones["type"], "array")
+        self.assertEqual(to_phones["items"], {"type": "string"})
+
+
+if __name__ == "__main__":
+    unittest.main()